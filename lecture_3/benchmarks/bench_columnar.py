@@ -0,0 +1,62 @@
+"""
+Time columnar per-student analytics: NumPy vs the pure-Python fallback.
+
+Usage:
+    python benchmarks/bench_columnar.py --students 1000000 --grades 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import ColumnarGrades, compute_statistics, np, top_n
+
+
+def generate(students, grades_per_student, seed=42):
+    """Columnar data directly, without building a StudentStore first"""
+    rng = random.Random(seed)
+    total = students * grades_per_student
+    grades = array('d', (rng.randint(0, 100) for _ in range(total)))
+    offsets = array('q', range(0, total + 1, grades_per_student))
+    return ColumnarGrades([f"Student {i}" for i in range(students)], grades, offsets)
+
+
+def run(columns, use_numpy, top):
+    start = time.perf_counter()
+    statistics = compute_statistics(columns, use_numpy=use_numpy)
+    stats_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    best = top_n(statistics, top)
+    return stats_seconds, time.perf_counter() - start, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--grades", type=int, default=10, help="Grades per student")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--skip-python", action="store_true", help="Only time NumPy")
+    args = parser.parse_args()
+
+    print(f"Generating {args.students} students x {args.grades} grades "
+          f"({args.students * args.grades} grades)...")
+    columns = generate(args.students, args.grades)
+
+    print(f"{'mode':<10} {'statistics (s)':>15} {'top-' + str(args.top) + ' (s)':>12} {'tied top':>9}")
+    print("-" * 50)
+    if np is not None:
+        stats_seconds, top_seconds, best = run(columns, True, args.top)
+        print(f"{'numpy':<10} {stats_seconds:>15.2f} {top_seconds:>12.4f} {len(best):>9}")
+    else:
+        print(f"{'numpy':<10} {'not installed':>15}")
+    if not args.skip_python:
+        stats_seconds, top_seconds, best = run(columns, False, args.top)
+        print(f"{'python':<10} {stats_seconds:>15.2f} {top_seconds:>12.4f} {len(best):>9}")
+
+
+if __name__ == "__main__":
+    main()
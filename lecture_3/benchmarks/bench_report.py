@@ -0,0 +1,75 @@
+"""
+Time report statistics and top-N: full recomputation vs running aggregates.
+
+Usage:
+    python benchmarks/bench_report.py --students 1000000 --grades 5 --top 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from student_store import StudentStore
+
+
+def recompute(store, n):
+    """The original approach: average every grade list, then scan for the top"""
+    averages = [sum(student.grades) / len(student.grades)
+                for student in store if student.grades]
+    ranked = sorted(averages, reverse=True)
+    cutoff = ranked[min(n, len(ranked)) - 1]
+    return (max(averages), min(averages), sum(averages) / len(averages),
+            [average for average in ranked if average >= cutoff])
+
+
+def running(store, n):
+    return (store.highest_average(), store.lowest_average(), store.overall_average(),
+            [average for _, average in store.top(n)])
+
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--grades", type=int, default=5, help="Grades per student")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    store = StudentStore()
+    start = time.perf_counter()
+    for i in range(args.students):
+        store.add_grades(store.add(f"Student {i}"),
+                         [float(rng.randint(0, 100)) for _ in range(args.grades)])
+    print(f"Loaded {args.students} students x {args.grades} grades "
+          f"in {time.perf_counter() - start:.2f}s (running aggregates included)")
+
+    expected, recompute_seconds = timed(recompute, store, args.top)
+    # The first ordered query builds the heaps with one pass
+    _, first_seconds = timed(running, store, args.top, repeat=1)
+    result, running_seconds = timed(running, store, args.top)
+    assert result[0] == expected[0] and result[1] == expected[1]
+    assert abs(result[2] - expected[2]) < 1e-6 and result[3] == expected[3]
+
+    print(f"{'method':<14} {'stats + top-' + str(args.top) + ' (ms)':>22}")
+    print("-" * 38)
+    print(f"{'recompute':<14} {recompute_seconds * 1000:>22.3f}")
+    print(f"{'running, first':<14} {first_seconds * 1000:>22.3f}")
+    print(f"{'running':<14} {running_seconds * 1000:>22.3f}")
+    print(f"\nSpeedup: {recompute_seconds / running_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Time the sharded report across 1..N worker processes against one in-process pass.
+
+Usage:
+    python benchmarks/bench_sharded.py --students 1000000 --grades 10 --top 10 --max-workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import ColumnarGrades
+from sharded_report import aggregate, merge, run_sharded
+
+
+def in_process(columns, k):
+    return merge([aggregate(columns.grades, columns.offsets, 0, len(columns), k)], k)
+
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--grades", type=int, default=10, help="Grades per student")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    grades = array('d', (float(rng.randint(0, 100))
+                         for _ in range(args.students * args.grades)))
+    offsets = array('q', range(0, len(grades) + 1, args.grades))
+    columns = ColumnarGrades([f"Student {i}" for i in range(args.students)], grades, offsets)
+
+    expected, baseline = timed(in_process, columns, args.top)
+    print(f"{args.students} students x {args.grades} grades, "
+          f"{os.cpu_count()} CPUs available")
+    print(f"{'workers':<12} {'seconds':>9} {'speedup':>9}")
+    print("-" * 32)
+    print(f"{'in-process':<12} {baseline:>9.3f} {1:>8.2f}x")
+    for workers in range(1, args.max_workers + 1):
+        result, seconds = timed(run_sharded, columns, args.top, workers)
+        assert result[:3] == expected[:3] and abs(result[3] - expected[3]) < 1e-6
+        assert result[4] == expected[4]
+        print(f"{workers:<12} {seconds:>9.3f} {baseline / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Time snapshot save/load against re-ingesting the same grades from CSV.
+
+Usage:
+    python benchmarks/bench_snapshot.py --students 200000 --grades 10 --changes 1000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import grade_entries, ingest, iter_records
+from snapshot import Snapshot
+from student_store import StudentStore
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--grades", type=int, default=10, help="Grades per student")
+    parser.add_argument("--changes", type=int, default=1_000, help="Grades added before re-saving")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "grades.csv")
+        snapshot_path = os.path.join(tmp, "grades.snap")
+
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "grade"])
+            for i in range(args.students):
+                for _ in range(args.grades):
+                    writer.writerow([f"Student {i}", rng.randint(0, 100)])
+
+        store = StudentStore()
+        stats = {"accepted": 0, "rejected": 0, "unsupported": 0}
+        _, csv_seconds = timed(ingest, store, grade_entries(iter_records(csv_path), stats))
+
+        snapshot = Snapshot(snapshot_path)
+        _, full_save_seconds = timed(snapshot.save, store)
+
+        loader = Snapshot(snapshot_path)
+        loaded, load_seconds = timed(loader.load)
+        assert len(loaded) == args.students
+        # The first query builds records, index and heaps from the mapping
+        top, first_query_seconds = timed(loaded.top, 3)
+        assert top[0][1] == store.top(3)[0][1]
+
+        for _ in range(args.changes):
+            student = loaded.get(f"Student {rng.randrange(args.students)}")
+            loaded.add_grade(student, float(rng.randint(0, 100)))
+        result, log_save_seconds = timed(loader.save, loaded)
+        _, compact_seconds = timed(loader.save, loaded, True)
+
+        print(f"{args.students} students x {args.grades} grades "
+              f"({os.path.getsize(snapshot_path) / 1e6:.1f} MB snapshot)")
+        print(f"{'operation':<32} {'seconds':>9}")
+        print("-" * 42)
+        print(f"{'ingest from CSV':<32} {csv_seconds:>9.3f}")
+        print(f"{'full snapshot save':<32} {full_save_seconds:>9.3f}")
+        print(f"{'snapshot load (mmap)':<32} {load_seconds:>9.3f}")
+        print(f"{'first query after load':<32} {first_query_seconds:>9.3f}")
+        print(f"{'save ' + str(args.changes) + ' changes (' + result + ')':<32} {log_save_seconds:>9.3f}")
+        print(f"{'compaction':<32} {compact_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
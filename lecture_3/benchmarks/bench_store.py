@@ -0,0 +1,100 @@
+"""
+Compare the list-of-dicts student storage with the indexed StudentStore.
+
+Usage:
+    python benchmarks/bench_store.py --students 1000000 --grades 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from student_store import StudentStore
+
+
+def build_dicts(names, grades):
+    """The original layout: a list of {"name", "grades": [float]} dicts"""
+    students = []
+    for name in names:
+        # + 0.0 allocates a fresh float per grade, as parsing input() does
+        students.append({"name": name, "grades": [grade + 0.0 for grade in grades]})
+    return students
+
+
+def build_store(names, grades):
+    store = StudentStore()
+    for name in names:
+        store.add_grades(store.add(name), grades)
+    return store
+
+
+def build_order(store):
+    """The top-N/lowest heaps, built by the first ordered query"""
+    store.top(10)
+    store.lowest_average()
+    return store
+
+
+def lookup_dicts(students, name):
+    """The original linear, lowercasing lookup"""
+    name_lower = name.lower()
+    for student in students:
+        if student["name"].lower() == name_lower:
+            return student
+    return None
+
+
+def measure_memory(build, *args):
+    """Build a structure under tracemalloc; returns (structure, bytes)"""
+    tracemalloc.start()
+    structure = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, current
+
+
+def time_lookups(lookup, names):
+    start = time.perf_counter()
+    for name in names:
+        lookup(name)
+    return (time.perf_counter() - start) / len(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--grades", type=int, default=5, help="Grades per student")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--linear-lookups", type=int, default=20,
+                        help="Lookups for the O(n) baseline (each scans the list)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = [f"Student {i}" for i in range(args.students)]
+    grades = [float(rng.randint(0, 100)) for _ in range(args.grades)]
+    probes = [rng.choice(names).upper() for _ in range(args.lookups)]
+
+    print(f"{args.students} students x {args.grades} grades")
+    students, dict_bytes = measure_memory(build_dicts, names, grades)
+    store, store_bytes = measure_memory(build_store, names, grades)
+    _, order_bytes = measure_memory(build_order, store)
+
+    dict_lookup = time_lookups(lambda name: lookup_dicts(students, name),
+                               probes[:args.linear_lookups])
+    store_lookup = time_lookups(store.get, probes)
+
+    print(f"{'layout':<16} {'memory (MB)':>12} {'lookup (us)':>14}")
+    print("-" * 44)
+    print(f"{'list of dicts':<16} {dict_bytes / 1e6:>12.1f} {dict_lookup * 1e6:>14.2f}")
+    print(f"{'StudentStore':<16} {store_bytes / 1e6:>12.1f} {store_lookup * 1e6:>14.2f}")
+    print(f"{'  + top/lowest':<16} {order_bytes / 1e6:>12.1f} {'':>14}")
+    print(f"\nMemory: {dict_bytes / store_bytes:.1f}x smaller, "
+          f"lookup: {dict_lookup / store_lookup:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback below
+    np = None
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+
+# Histogram bin edges; the last bin includes 100
+HISTOGRAM_EDGES = (0, 60, 70, 80, 90, 100)
+
+
+class ColumnarGrades:
+    """
+    Every grade in one contiguous buffer, with student i's grades at
+    grades[offsets[i]:offsets[i + 1]]
+    """
+    __slots__ = ("names", "grades", "offsets")
+
+    def __init__(self, names, grades, offsets):
+        self.names = names
+        self.grades = grades
+        self.offsets = offsets
+
+    @classmethod
+    def from_store(cls, store):
+        if not store.keep_grades:
+            raise ValueError("Store keeps aggregates only; individual grades are not available")
+        names = []
+        grades = array('d')
+        offsets = array('q', [0])
+        for student in store:
+            names.append(student.name)
+            grades.extend(student.grades)
+            offsets.append(len(grades))
+        return cls(names, grades, offsets)
+
+    def __len__(self):
+        return len(self.names)
+
+
+def compute_statistics(columns, percentiles=DEFAULT_PERCENTILES, edges=HISTOGRAM_EDGES,
+                       use_numpy=None):
+    """
+    Per-student count, mean, median, population stddev, percentiles
+    (linear interpolation) and histogram counts over `edges`.
+
+    Returns a dict of equal-length sequences (NumPy arrays when NumPy is
+    used, lists otherwise); statistics of students without grades are NaN.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _numpy_statistics(columns, percentiles, edges)
+    return _python_statistics(columns, percentiles, edges)
+
+
+def _numpy_statistics(columns, percentiles, edges):
+    grades = np.frombuffer(columns.grades, dtype=np.float64)
+    offsets = np.frombuffer(columns.offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    n = len(counts)
+    graded = counts > 0
+    nbins = len(edges) - 1
+
+    means = np.full(n, np.nan)
+    stddevs = np.full(n, np.nan)
+    percentile_values = {p: np.full(n, np.nan) for p in (50,) + tuple(percentiles)}
+    histogram = np.zeros((n, nbins), dtype=np.int64)
+
+    if grades.size:
+        owners = np.repeat(np.arange(n), counts)
+        # reduceat over the starts of non-empty students: empty ones in
+        # between contribute no elements
+        starts = offsets[:-1][graded]
+        means[graded] = np.add.reduceat(grades, starts) / counts[graded]
+        deviations = grades - means[owners]
+        stddevs[graded] = np.sqrt(np.add.reduceat(deviations * deviations, starts)
+                                  / counts[graded])
+
+        # Sort within each student, then index the interpolation ranks
+        pick = _segment_sorter(grades, owners, offsets, counts, graded)
+        graded_counts = counts[graded]
+        for p in percentile_values:
+            rank = p / 100 * (graded_counts - 1)
+            lower = np.floor(rank).astype(np.int64)
+            upper = np.ceil(rank).astype(np.int64)
+            low_values = pick(lower)
+            high_values = pick(upper)
+            percentile_values[p][graded] = low_values + (high_values - low_values) * (rank - lower)
+
+        bins = np.clip(np.searchsorted(edges, grades, side='right') - 1, 0, nbins - 1)
+        histogram = np.bincount(owners * nbins + bins, minlength=n * nbins).reshape(n, nbins)
+
+    return {
+        'names': columns.names,
+        'count': counts,
+        'mean': means,
+        'median': percentile_values[50],
+        'stddev': stddevs,
+        'percentiles': {p: percentile_values[p] for p in percentiles},
+        'histogram': histogram,
+        'edges': edges,
+    }
+
+
+def _segment_sorter(grades, owners, offsets, counts, graded):
+    """
+    Sort each student's grades and return pick(positions): the value at
+    each graded student's sorted position. Rows padded to the longest
+    student sort far faster than a lexsort of the whole column, so they
+    are used unless padding would more than quadruple memory.
+    """
+    max_count = int(counts.max())
+    if len(counts) * max_count <= 4 * grades.size:
+        padded = np.full((len(counts), max_count), np.inf)
+        padded[owners, np.arange(grades.size) - offsets[:-1][owners]] = grades
+        padded.sort(axis=1)
+        rows = np.flatnonzero(graded)
+
+        def pick(positions):
+            return padded[rows, positions]
+    else:
+        ordered = grades[np.lexsort((grades, owners))]
+        starts = offsets[:-1][graded]
+
+        def pick(positions):
+            return ordered[starts + positions]
+    return pick
+
+
+def _percentile(ordered, p):
+    rank = p / 100 * (len(ordered) - 1)
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _python_statistics(columns, percentiles, edges):
+    grades, offsets = columns.grades, columns.offsets
+    nbins = len(edges) - 1
+    result = {
+        'names': columns.names,
+        'count': [],
+        'mean': [],
+        'median': [],
+        'stddev': [],
+        'percentiles': {p: [] for p in percentiles},
+        'histogram': [],
+        'edges': edges,
+    }
+    for i in range(len(columns)):
+        student_grades = grades[offsets[i]:offsets[i + 1]]
+        count = len(student_grades)
+        result['count'].append(count)
+        bins = [0] * nbins
+        if not count:
+            for key in ('mean', 'median', 'stddev'):
+                result[key].append(math.nan)
+            for p in percentiles:
+                result['percentiles'][p].append(math.nan)
+            result['histogram'].append(bins)
+            continue
+
+        mean = sum(student_grades) / count
+        ordered = sorted(student_grades)
+        result['mean'].append(mean)
+        result['median'].append(_percentile(ordered, 50))
+        result['stddev'].append(math.sqrt(sum((g - mean) ** 2 for g in student_grades) / count))
+        for p in percentiles:
+            result['percentiles'][p].append(_percentile(ordered, p))
+        for grade in student_grades:
+            index = 0
+            while index < nbins - 1 and grade >= edges[index + 1]:
+                index += 1
+            bins[index] += 1
+        result['histogram'].append(bins)
+    return result
+
+
+def top_n(statistics, n=1):
+    """
+    Names and means of the n best students, plus anyone tied with the
+    n-th, best first (ties in insertion order). Uses argpartition when the
+    statistics came from NumPy.
+    """
+    means = statistics['mean']
+    names = statistics['names']
+    if np is not None and isinstance(means, np.ndarray):
+        candidates = np.flatnonzero(~np.isnan(means))
+        if not candidates.size:
+            return []
+        k = min(n, candidates.size)
+        best = candidates[np.argpartition(-means[candidates], k - 1)[:k]]
+        cutoff = means[best].min()
+        chosen = candidates[means[candidates] >= cutoff]
+        chosen = chosen[np.lexsort((chosen, -means[chosen]))]
+        return [(names[i], float(means[i])) for i in chosen]
+
+    graded = [(mean, i) for i, mean in enumerate(means) if not math.isnan(mean)]
+    if not graded:
+        return []
+    ranked = sorted(graded, key=lambda item: (-item[0], item[1]))
+    cutoff = ranked[min(n, len(ranked)) - 1][0]
+    return [(names[i], mean) for mean, i in ranked if mean >= cutoff]
@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+import sys
+from itertools import groupby, islice
+from operator import itemgetter
+
+FORMATS = ('csv', 'ndjson')
+
+# Most grades of one student held at once while ingesting
+INGEST_CHUNK = 10_000
+
+
+def parse_grade(value, grade_range=(0, 100), whole=False):
+    """
+    Grade as a float in grade_range (and a whole number if `whole`);
+    raises ValueError with the user-facing message
+    """
+    try:
+        grade = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("Please enter a valid number")
+    low, high = grade_range
+    if not low <= grade <= high:
+        raise ValueError(f"Grade must be between {low} and {high}")
+    if whole and not grade.is_integer():
+        raise ValueError("Grade must be a whole number")
+    return grade
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    raise ValueError(f"Unsupported file type: {path} (use .csv, .ndjson or .jsonl)")
+
+
+def iter_records(path, file_format=None):
+    """
+    Stream {"name", "grade"} records from a CSV file with a name,grade
+    header or from NDJSON. "-" reads stdin (CSV unless file_format says otherwise).
+    """
+    file_format = file_format or ('csv' if path == '-' else detect_format(path))
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+    try:
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def grade_entries(records, stats, grade_range=(0, 100), whole=False):
+    """
+    Validated (name, grade) pairs; bad records are counted, not printed.
+    Valid grades the storage can't hold (outside grade_range, or not
+    whole) are also counted as 'unsupported', so callers can report them.
+    """
+    for record in records:
+        try:
+            name = str(record['name']).strip()
+            grade = parse_grade(record['grade'])
+        except (KeyError, TypeError, ValueError):
+            stats['rejected'] += 1
+            continue
+        if not name:
+            stats['rejected'] += 1
+            continue
+        try:
+            grade = parse_grade(grade, grade_range, whole)
+        except ValueError:
+            stats['rejected'] += 1
+            stats['unsupported'] += 1
+            continue
+        stats['accepted'] += 1
+        yield name, grade
+
+
+def ingest(store, entries):
+    """
+    Add (name, grade) pairs to the store, creating students on first
+    sight. Consecutive grades for the same student are applied in
+    batches of up to INGEST_CHUNK, so a long run of one student's grades
+    is never held in memory. Returns the number of students created.
+    """
+    created = 0
+    for name, group in groupby(entries, key=itemgetter(0)):
+        student = store.get(name)
+        if student is None:
+            student = store.add(name)
+            created += 1
+        grades = map(itemgetter(1), group)
+        chunk = tuple(islice(grades, INGEST_CHUNK))
+        while chunk:
+            store.add_grades(student, chunk)
+            chunk = tuple(islice(grades, INGEST_CHUNK))
+    return created
+
+
+def ingest_paths(store, paths, file_format=None):
+    """Stream every path into the store; returns accepted/rejected/unsupported/students counts"""
+    stats = {'accepted': 0, 'rejected': 0, 'unsupported': 0, 'students': 0}
+    for path in paths:
+        entries = grade_entries(iter_records(path, file_format), stats,
+                                store.grade_range, store.whole_grades)
+        stats['students'] += ingest(store, entries)
+    return stats
@@ -1,8 +1,40 @@
+import argparse
+
+from student_store import StudentStore
+from columnar import ColumnarGrades, DEFAULT_PERCENTILES, compute_statistics, top_n
+from ingest import FORMATS, ingest_paths, parse_grade
+from snapshot import Snapshot
+from sharded_report import ShardedReport
+from sqlite_storage import SQLiteStorage
+
+
 class StudentGradeAnalyzer:
     """Student Grade Analyzer Program"""
     
-    def __init__(self):
-        self.students = []
+    def __init__(self, keep_grades=True, workers=None, storage=None):
+        # Any StorageBackend; students and grades are kept in memory by default
+        self.students = storage if storage is not None else StudentStore(keep_grades)
+        self.snapshot = None
+        # Batch reports are computed by this many processes when set
+        self.workers = workers
+        # Answers overall statistics and top-N: the store, or a sharded report
+        self.statistics = self.students
+    
+    def load_snapshot(self, path):
+        """Start from the state saved at path (mapped, not parsed)"""
+        self.snapshot = Snapshot(path)
+        self.students = self.snapshot.load()
+        self.statistics = self.students
+    
+    def save_snapshot(self):
+        """Save changes since the last load/save, if a snapshot is attached"""
+        if self.snapshot is None:
+            return
+        result = self.snapshot.save(self.students)
+        if result == "snapshot":
+            print(f"State saved to {self.snapshot.path}")
+        elif result == "log":
+            print(f"Changes appended to {self.snapshot.path}.log")
     
     def display_menu(self):
         """Display the main menu"""
@@ -15,23 +47,14 @@ class StudentGradeAnalyzer:
     
     def _get_student_by_name(self, name):
         """Find student by name (case-insensitive)"""
-        name_lower = name.lower()
-        for student in self.students:
-            if student["name"].lower() == name_lower:
-                return student
-        return None
+        return self.students.get(name)
     
     def _validate_grade(self, grade_str):
         """Validate and convert grade input"""
         try:
-            grade = float(grade_str)
-            if 0 <= grade <= 100:
-                return grade
-            else:
-                print("Error: Grade must be between 0 and 100")
-                return None
-        except ValueError:
-            print("Error: Please enter a valid number")
+            return parse_grade(grade_str, self.students.grade_range, self.students.whole_grades)
+        except ValueError as e:
+            print(f"Error: {e}")
             return None
     
     def _get_student_name_input(self):
@@ -48,15 +71,10 @@ class StudentGradeAnalyzer:
         if not name:
             return
         
-        if self._get_student_by_name(name):
+        if self.students.add(name) is None:
             print(f"Error: Student '{name}' already exists!")
             return
         
-        new_student = {
-            "name": name,
-            "grades": []
-        }
-        self.students.append(new_student)
         print(f"Student '{name}' added successfully!")
     
     def add_grades_for_student(self):
@@ -74,17 +92,18 @@ class StudentGradeAnalyzer:
             print(f"Error: Student '{name}' not found!")
             return
         
-        print(f"Adding grades for {student['name']}:")
+        print(f"Adding grades for {student.name}:")
         
         while True:
-            grade_input = input("Enter a grade (0-100) or 'done' to finish: ").strip().lower()
+            low, high = self.students.grade_range
+            grade_input = input(f"Enter a grade ({low}-{high}) or 'done' to finish: ").strip().lower()
             
             if grade_input == 'done':
                 break
             
             grade = self._validate_grade(grade_input)
             if grade is not None:
-                student["grades"].append(grade)
+                self.students.add_grade(student, grade)
                 print(f"Grade {grade} added successfully!")
     
     def calculate_average(self, grades):
@@ -93,19 +112,6 @@ class StudentGradeAnalyzer:
             return None
         return sum(grades) / len(grades)
     
-    def _get_student_statistics(self):
-        """Calculate statistics for all students"""
-        averages = []
-        valid_averages = []
-        
-        for student in self.students:
-            avg = self.calculate_average(student["grades"])
-            averages.append(avg)
-            if avg is not None:
-                valid_averages.append(avg)
-        
-        return averages, valid_averages
-    
     def show_report(self):
         """Generate and display full report"""
         if not self.students:
@@ -114,53 +120,83 @@ class StudentGradeAnalyzer:
         
         print("\n--- Student Report ---")
         
-        averages, valid_averages = self._get_student_statistics()
-        
-        # Display individual student averages
-        for student, avg in zip(self.students, averages):
+        # Averages are running totals kept by the store; nothing is recomputed
+        for student in self.students:
+            avg = student.average
             if avg is not None:
-                print(f"{student['name']}'s average grade is {avg:.1f}.")
+                print(f"{student.name}'s average grade is {avg:.1f}.")
             else:
-                print(f"{student['name']}'s average grade is N/A.")
+                print(f"{student.name}'s average grade is N/A.")
         
         # Display overall statistics
-        if valid_averages:
+        if self.statistics.graded:
             print("\n--- Overall Statistics ---")
-            print(f"Highest average: {max(valid_averages):.1f}")
-            print(f"Lowest average: {min(valid_averages):.1f}")
-            print(f"Overall average: {sum(valid_averages) / len(valid_averages):.1f}")
+            print(f"Highest average: {self.statistics.highest_average():.1f}")
+            print(f"Lowest average: {self.statistics.lowest_average():.1f}")
+            print(f"Overall average: {self.statistics.overall_average():.1f}")
         else:
             print("\nNo valid averages to calculate statistics.")
     
+    def batch_statistics(self, percentiles=DEFAULT_PERCENTILES):
+        """Per-student mean, median, stddev, percentiles and histogram, columnar"""
+        return compute_statistics(ColumnarGrades.from_store(self.students), percentiles)
+    
+    def batch_top_students(self, n=1):
+        """Top n students ranked from batch_statistics, ties included"""
+        return top_n(self.batch_statistics(), n)
+    
+    def top_students(self, n=1):
+        """Top n students by average as [(student, average)], ties included"""
+        return self.statistics.top(n)
+    
     def find_top_performer(self):
         """Find student(s) with highest average grade"""
         if not self.students:
             print("No students available.")
             return
         
-        top_students = []
-        top_avg = -1
-        
-        for student in self.students:
-            avg = self.calculate_average(student["grades"])
-            if avg is not None:
-                if avg > top_avg:
-                    top_avg = avg
-                    top_students = [student]
-                elif avg == top_avg:
-                    top_students.append(student)
-        
-        if not top_students:
+        top = self.top_students(1)
+        if not top:
             print("No students with grades available.")
             return
         
-        if len(top_students) == 1:
-            student = top_students[0]
-            print(f"Top student: {student['name']} with {top_avg:.1f} average")
+        top_avg = top[0][1]
+        if len(top) == 1:
+            student = top[0][0]
+            print(f"Top student: {student.name} with {top_avg:.1f} average")
         else:
-            names = ", ".join(student['name'] for student in top_students)
+            names = ", ".join(student.name for student, _ in top)
             print(f"Top students (tie): {names} with {top_avg:.1f} average")
     
+    def show_top_students(self, n):
+        """Print the top n students, ties included"""
+        top = self.top_students(n)
+        if not top:
+            print("No students with grades available.")
+            return
+        print(f"--- Top {n} Students ---")
+        for rank, (student, avg) in enumerate(top, 1):
+            print(f"{rank}. {student.name} with {avg:.1f} average")
+    
+    def run_batch(self, paths, file_format=None, top=1):
+        """Stream name,grade records from files or stdin, then report"""
+        stats = ingest_paths(self.students, paths, file_format)
+        print(f"Loaded {stats['accepted']} grades for {len(self.students)} students "
+              f"({stats['rejected']} invalid records skipped)")
+        if stats['unsupported']:
+            low, high = self.students.grade_range
+            kind = "whole-number grades" if self.students.whole_grades else "grades"
+            print(f"Warning: {stats['unsupported']} of them were valid grades this storage "
+                  f"can't hold; it accepts {kind} from {low} to {high} only")
+        if self.workers:
+            self.statistics = ShardedReport(self.students, top, self.workers)
+        self.show_report()
+        print()
+        if top > 1:
+            self.show_top_students(top)
+        else:
+            self.find_top_performer()
+    
     def _handle_menu_choice(self, choice):
         """Handle menu choice selection"""
         menu_actions = {
@@ -189,6 +225,7 @@ class StudentGradeAnalyzer:
                 continue
             
             if choice == '5':
+                self.save_snapshot()
                 print("Thank you for using Student Grade Analyzer. Goodbye!")
                 break
             
@@ -200,9 +237,35 @@ class StudentGradeAnalyzer:
 
 
 def main():
-    """Launch the Student Grade Analyzer"""
-    analyzer = StudentGradeAnalyzer()
-    analyzer.run()
+    """Launch the Student Grade Analyzer, interactive unless input files are given"""
+    parser = argparse.ArgumentParser(description="Student Grade Analyzer")
+    parser.add_argument('inputs', nargs='*',
+                        help="name,grade CSV or NDJSON files to analyze without prompts ('-' for stdin)")
+    parser.add_argument('--format', choices=FORMATS, help="Input format (default: by file extension)")
+    parser.add_argument('--top', type=int, default=1, help="Number of top students to list")
+    parser.add_argument('--snapshot', help="Load state from this snapshot and save changes back")
+    parser.add_argument('--workers', type=int,
+                        help="Compute batch statistics and top students in this many processes")
+    parser.add_argument('--db', help="Keep students and grades in this SQLite database "
+                                     "(lecture_4 school.db schema) instead of memory")
+    args = parser.parse_args()
+    if args.db and (args.snapshot or args.workers):
+        parser.error("--db can't be combined with --snapshot or --workers")
+    
+    # Without a snapshot or workers, batch mode keeps only running totals,
+    # so memory grows with students, not grades
+    keep_grades = not args.inputs or bool(args.snapshot) or bool(args.workers)
+    storage = SQLiteStorage(args.db) if args.db else None
+    analyzer = StudentGradeAnalyzer(keep_grades, args.workers, storage)
+    if args.snapshot:
+        analyzer.load_snapshot(args.snapshot)
+    
+    if args.inputs:
+        analyzer.run_batch(args.inputs, args.format, args.top)
+        analyzer.save_snapshot()
+    else:
+        analyzer.run()
+    analyzer.students.close()
 
 
 if __name__ == "__main__":
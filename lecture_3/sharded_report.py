@@ -0,0 +1,166 @@
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from heapq import nlargest
+from multiprocessing import shared_memory
+
+from columnar import ColumnarGrades
+
+# Shards per worker: more shards than workers evens out uneven shards
+SHARDS_PER_WORKER = 4
+
+# Set in each worker process by _attach: (shared blocks, grades, offsets)
+_shared = None
+
+
+def shard_bounds(offsets, shards):
+    """
+    Split students into up to `shards` contiguous [start, end) ranges of
+    roughly equal grade counts (offsets as in ColumnarGrades).
+    """
+    students = len(offsets) - 1
+    total = offsets[-1]
+    bounds = []
+    start = 0
+    for i in range(1, shards + 1):
+        end = students if i == shards else bisect_left(offsets, total * i // shards, start)
+        end = min(max(end, start), students)
+        if end > start:
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def aggregate(grades, offsets, start, end, k):
+    """
+    Partial report over students [start, end): (sum of averages, graded
+    students, lowest average, highest average, local top) where the local
+    top is [(average, position)] for the k best plus anyone tied with the
+    k-th.
+    """
+    averages = []
+    positions = []
+    for position in range(start, end):
+        first, last = offsets[position], offsets[position + 1]
+        if last > first:
+            averages.append(sum(grades[first:last]) / (last - first))
+            positions.append(position)
+    if not averages:
+        return 0.0, 0, None, None, []
+    cutoff = nlargest(k, averages)[-1]
+    local_top = [(average, position) for average, position in zip(averages, positions)
+                 if average >= cutoff]
+    return sum(averages), len(averages), min(averages), max(averages), local_top
+
+
+def merge(partials, k):
+    """
+    Combine partial reports into (graded, lowest, highest, overall average,
+    top) with top as [(position, average)], best first, ties included and
+    in insertion order.
+    """
+    average_sum = 0.0
+    graded = 0
+    lowest = highest = None
+    candidates = []
+    for part_sum, part_graded, part_lowest, part_highest, local_top in partials:
+        if not part_graded:
+            continue
+        average_sum += part_sum
+        graded += part_graded
+        lowest = part_lowest if lowest is None else min(lowest, part_lowest)
+        highest = part_highest if highest is None else max(highest, part_highest)
+        candidates.extend(local_top)
+    if not graded:
+        return 0, None, None, None, []
+
+    # Every global top-k student is in its shard's local top-k (with ties)
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+    cutoff = candidates[min(k, len(candidates)) - 1][0]
+    top = [(position, average) for average, position in candidates if average >= cutoff]
+    return graded, lowest, highest, average_sum / graded, top
+
+
+def _share(values):
+    """Copy an array into a new shared memory block"""
+    block = shared_memory.SharedMemory(create=True, size=max(len(values) * values.itemsize, 1))
+    block.buf[:len(values) * values.itemsize] = memoryview(values).cast('B')
+    return block
+
+
+def _attach(grades_name, grades_count, offsets_name, offsets_count):
+    """Worker initializer: map the shared grade and offset buffers once"""
+    global _shared
+    blocks = (shared_memory.SharedMemory(name=grades_name),
+              shared_memory.SharedMemory(name=offsets_name))
+    grades = blocks[0].buf[:8 * grades_count].cast('d')
+    offsets = blocks[1].buf[:8 * offsets_count].cast('q')
+    _shared = blocks, grades, offsets
+
+
+def _aggregate_shard(start, end, k):
+    _, grades, offsets = _shared
+    return aggregate(grades, offsets, start, end, k)
+
+
+class ShardedReport:
+    """
+    Overall statistics and top-k of a store, computed by a process pool
+    over shards of students. Answers the same queries as the store
+    (highest/lowest/overall average, graded, top(n) for n <= k), so
+    reports can print either.
+    """
+
+    def __init__(self, store, k=1, workers=None, shards=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.k = max(k, 1)
+        columns = ColumnarGrades.from_store(store)
+        records = list(store)
+        (self.graded, self._lowest, self._highest, self._overall,
+         top) = run_sharded(columns, self.k, self.workers, shards)
+        self._top = [(records[position], average) for position, average in top]
+
+    def highest_average(self):
+        return self._highest
+
+    def lowest_average(self):
+        return self._lowest
+
+    def overall_average(self):
+        return self._overall
+
+    def top(self, n=1):
+        """The n best students as [(record, average)], ties included"""
+        if n > self.k:
+            raise ValueError(f"Report was computed for the top {self.k} only")
+        if not self._top:
+            return []
+        cutoff = self._top[min(n, len(self._top)) - 1][1]
+        return [(record, average) for record, average in self._top if average >= cutoff]
+
+
+def run_sharded(columns, k=1, workers=None, shards=None):
+    """
+    Compute (graded, lowest, highest, overall average, top-k) of a
+    ColumnarGrades with `workers` processes. Grades and offsets are copied
+    once into shared memory; workers map them instead of receiving pickled
+    copies, and return only their partial aggregates.
+    """
+    workers = workers or os.cpu_count() or 1
+    bounds = shard_bounds(columns.offsets, shards or workers * SHARDS_PER_WORKER)
+    if not bounds:
+        return merge([], k)
+
+    grades_block = _share(columns.grades)
+    offsets_block = _share(columns.offsets)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(grades_block.name, len(columns.grades),
+                                           offsets_block.name, len(columns.offsets))) as pool:
+            futures = [pool.submit(_aggregate_shard, start, end, k) for start, end in bounds]
+            partials = [future.result() for future in futures]
+    finally:
+        for block in (grades_block, offsets_block):
+            block.close()
+            block.unlink()
+    return merge(partials, k)
@@ -0,0 +1,221 @@
+import mmap
+import os
+import struct
+from array import array
+
+from student_store import StudentStore
+
+# Snapshot layout (little-endian, every section 8-byte aligned):
+#   header   magic, version, reserved, generation, students, grades, names bytes
+#   offsets  int64[students + 1]   student i owns grades[offsets[i]:offsets[i + 1]]
+#   totals   float64[students]     running totals, so averages need no pass
+#   grades   float64[grades]
+#   names    UTF-8, NUL-separated
+# Loading maps the file and hands the store memoryviews of it: nothing is
+# parsed per grade, and pages are only read when touched.
+SNAPSHOT_MAGIC = b'SGA1'
+SNAPSHOT_HEADER = struct.Struct('<4sHHQQQQ')
+SNAPSHOT_VERSION = 1
+
+# Change log next to the snapshot: header (magic, generation of the
+# snapshot it extends), then records of
+#   uint32 name length, name, uint32 grade count, float64 grades
+# A record with no grades adds a student. A torn last record is ignored,
+# and cut off before the next append so new records never follow garbage.
+LOG_MAGIC = b'SGL1'
+LOG_HEADER = struct.Struct('<4sQ')
+LOG_RECORD = struct.Struct('<I')
+
+# Rewrite the snapshot once the log holds this share of its grades
+COMPACT_RATIO = 0.25
+COMPACT_MIN_ENTRIES = 10_000
+
+
+def log_path(path):
+    return path + '.log'
+
+
+def write_snapshot(store, path):
+    """Write the whole store as a new snapshot (atomically) and drop its log"""
+    if not store.keep_grades:
+        raise ValueError("Store keeps aggregates only; individual grades can't be saved")
+    names = [student.name for student in store]
+    if any('\0' in name for name in names):
+        raise ValueError("Student names can't contain NUL characters")
+
+    offsets = array('q', [0])
+    totals = array('d')
+    for student in store:
+        offsets.append(offsets[-1] + student.count)
+        totals.append(student.total)
+    names_blob = '\0'.join(names).encode('utf-8')
+    generation = int.from_bytes(os.urandom(8), 'little')
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, generation,
+                                     len(names), offsets[-1], len(names_blob)))
+        f.write(offsets.tobytes())
+        f.write(totals.tobytes())
+        for student in store:
+            f.write(student.grades)
+        f.write(names_blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+    # The old log is already folded in; a stale one would also be ignored
+    # on load because its generation no longer matches
+    if os.path.exists(log_path(path)):
+        os.remove(log_path(path))
+    return generation
+
+
+def read_snapshot(path):
+    """
+    Map a snapshot and return (store, generation, grade count). Grades stay
+    views into the mapping until a student gets a new grade.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = SNAPSHOT_HEADER.unpack_from(mapped, 0)
+    magic, version, _, generation, students, grades, names_size = header
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a grade analyzer snapshot")
+
+    view = memoryview(mapped)
+    position = SNAPSHOT_HEADER.size
+    offsets = view[position:position + 8 * (students + 1)].cast('q')
+    position += 8 * (students + 1)
+    totals = view[position:position + 8 * students].cast('d')
+    position += 8 * students
+    grade_view = view[position:position + 8 * grades].cast('d')
+    position += 8 * grades
+    names = []
+    if students:
+        names = bytes(view[position:position + names_size]).decode('utf-8').split('\0')
+
+    return StudentStore.restore(names, totals, offsets, grade_view), generation, grades
+
+
+def _encode_changes(changes):
+    chunks = []
+    for name, grades in changes:
+        encoded = name.encode('utf-8')
+        chunks.append(LOG_RECORD.pack(len(encoded)))
+        chunks.append(encoded)
+        chunks.append(LOG_RECORD.pack(len(grades)))
+        chunks.append(array('d', grades).tobytes())
+    return b''.join(chunks)
+
+
+def append_log(path, generation, changes, valid_end=0):
+    """
+    Append journal entries to the snapshot's change log after its last
+    valid record (valid_end, from read_log). Anything past that point, a
+    torn record or a log of another generation, is discarded first.
+    Returns the new end offset.
+    """
+    log = log_path(path)
+    with open(log, 'r+b' if os.path.exists(log) else 'wb') as f:
+        if valid_end:
+            f.seek(valid_end)
+        else:
+            f.write(LOG_HEADER.pack(LOG_MAGIC, generation))
+        f.truncate()
+        f.write(_encode_changes(changes))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def read_log(path, generation):
+    """
+    Return ([(name, grades)] logged against this snapshot generation,
+    offset just past the last valid record). The offset is 0 when there
+    is no usable log.
+    """
+    log = log_path(path)
+    if not os.path.exists(log):
+        return [], 0
+    with open(log, 'rb') as f:
+        data = f.read()
+    if len(data) < LOG_HEADER.size:
+        return [], 0
+    magic, log_generation = LOG_HEADER.unpack_from(data, 0)
+    if magic != LOG_MAGIC or log_generation != generation:
+        return [], 0
+    changes = []
+    position = LOG_HEADER.size
+    while position + LOG_RECORD.size <= len(data):
+        (name_size,) = LOG_RECORD.unpack_from(data, position)
+        name_end = position + LOG_RECORD.size + name_size
+        if name_end + LOG_RECORD.size > len(data):
+            break
+        (count,) = LOG_RECORD.unpack_from(data, name_end)
+        grades_end = name_end + LOG_RECORD.size + 8 * count
+        if grades_end > len(data):
+            break
+        try:
+            name = data[position + LOG_RECORD.size:name_end].decode('utf-8')
+        except UnicodeDecodeError:
+            break
+        changes.append((name, array('d', data[name_end + LOG_RECORD.size:grades_end])))
+        position = grades_end
+    return changes, position
+
+
+class Snapshot:
+    """
+    A store persisted at `path`: load() maps the snapshot and replays its
+    log; save() appends only what changed since, compacting the log into
+    a new snapshot once it grows past COMPACT_RATIO of the saved grades.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.generation = None
+        self.saved_grades = 0
+        self.logged_grades = 0
+        # End of the log's last valid record; 0 starts a new log
+        self.log_end = 0
+
+    def load(self):
+        """Return the saved store (empty if there is no snapshot yet)"""
+        if not os.path.exists(self.path):
+            store = StudentStore()
+        else:
+            store, self.generation, self.saved_grades = read_snapshot(self.path)
+            changes, self.log_end = read_log(self.path, self.generation)
+            for name, grades in changes:
+                student = store.get(name) or store.add(name)
+                if grades:
+                    store.add_grades(student, grades)
+                self.logged_grades += len(grades) + 1
+        store.journal = []
+        return store
+
+    def save(self, store, compact=False):
+        """
+        Persist changes since the last load/save. Returns "snapshot" when
+        a full snapshot was written, "log" when changes were appended and
+        None when there was nothing to save.
+        """
+        changes = store.journal or []
+        pending = sum(len(grades) + 1 for _, grades in changes)
+        due = self.logged_grades + pending > max(COMPACT_MIN_ENTRIES,
+                                                 COMPACT_RATIO * self.saved_grades)
+        if self.generation is None or compact or due:
+            self.generation = write_snapshot(store, self.path)
+            self.saved_grades = sum(student.count for student in store)
+            self.logged_grades = 0
+            self.log_end = 0
+            result = "snapshot"
+        elif changes:
+            self.log_end = append_log(self.path, self.generation, changes, self.log_end)
+            self.logged_grades += pending
+            result = "log"
+        else:
+            result = None
+        store.journal = []
+        return result
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import sys
+
+from ingest import parse_grade
+from storage import StorageBackend
+
+# lecture_4 owns the school.db schema (schema.sql) and its summary tables.
+# Appended, not prepended, so lecture_3's own modules (main) still win.
+LECTURE_4_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'lecture_4')
+if LECTURE_4_DIR not in sys.path:
+    sys.path.append(LECTURE_4_DIR)
+
+from schema_builder import schema_statements
+from summary_stats import ensure_summary_tables
+
+# Name lookups; not part of schema.sql
+NAME_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_student_name ON students(full_name COLLATE NOCASE)"
+
+# The analyzer knows no subjects; grades it adds get this one. Students it
+# adds have a NULL (unknown) birth year.
+DEFAULT_SUBJECT = 'General'
+
+# Grade rows buffered before one executemany + commit
+DEFAULT_BATCH_SIZE = 10_000
+
+FIND_SQL = """
+SELECT id, full_name FROM students
+WHERE full_name = ? COLLATE NOCASE
+ORDER BY id LIMIT 1
+"""
+
+# Averages come from lecture_4's student_stats, kept current by triggers
+# on grades, so no query aggregates the grades table itself
+STUDENTS_SQL = """
+SELECT s.id, s.full_name, st.avg_grade
+FROM students s
+LEFT JOIN student_stats st ON st.student_id = s.id
+ORDER BY s.id
+"""
+
+SUMMARY_SQL = """
+SELECT COUNT(*), MAX(avg_grade), MIN(avg_grade), AVG(avg_grade)
+FROM student_stats
+"""
+
+# Everyone at or above the n-th best average (or the lowest, with fewer);
+# both parts walk idx_student_stats_avg
+TOP_SQL = """
+SELECT s.id, s.full_name, st.avg_grade
+FROM student_stats st
+JOIN students s ON s.id = st.student_id
+WHERE st.avg_grade >= (SELECT MIN(avg_grade) FROM
+                       (SELECT avg_grade FROM student_stats ORDER BY avg_grade DESC LIMIT ?))
+ORDER BY st.avg_grade DESC, s.id
+"""
+
+_UNKNOWN = object()
+
+
+def _allow_unknown_birth_year(conn, tables):
+    """
+    Databases created before students.birth_year became nullable declare
+    it NOT NULL; rebuild that table from the current schema.sql statement,
+    keeping ids, rows and the AUTOINCREMENT counter.
+    """
+    columns = conn.execute("PRAGMA table_info(students)").fetchall()
+    if not any(name == 'birth_year' and notnull for _, name, _, notnull, _, _ in columns):
+        return
+    create = next(sql for sql in tables if sql.split('(')[0].split()[-1] == 'students')
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'students'").fetchone()
+    conn.execute("BEGIN")
+    conn.execute(create.replace(' students ', ' students_migrated ', 1))
+    conn.execute("INSERT INTO students_migrated (id, full_name, birth_year) "
+                 "SELECT id, full_name, birth_year FROM students")
+    conn.execute("DROP TABLE students")
+    conn.execute("ALTER TABLE students_migrated RENAME TO students")
+    if sequence:
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'students'",
+                     sequence)
+    conn.commit()
+
+
+def ensure_schema(conn, base_dir=LECTURE_4_DIR):
+    """
+    Create whatever part of the school.db schema (schema.sql, via
+    schema_builder) and of the summary tables is missing
+    """
+    tables, indexes = schema_statements(base_dir)
+    for sql in tables:
+        conn.execute(sql)
+    _allow_unknown_birth_year(conn, tables)
+    for sql in indexes.values():
+        conn.execute(sql)
+    conn.execute(NAME_INDEX_SQL)
+    conn.commit()
+    ensure_summary_tables(conn)
+    conn.commit()
+
+
+class SQLiteStudent:
+    """A students row; the average is read from the database when first needed"""
+    __slots__ = ("storage", "id", "name", "_average")
+
+    def __init__(self, storage, student_id, name, average=_UNKNOWN):
+        self.storage = storage
+        self.id = student_id
+        self.name = name
+        self._average = average
+
+    @property
+    def average(self):
+        if self._average is _UNKNOWN:
+            self._average = self.storage.student_average(self.id)
+        return self._average
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Students and grades in the students/grades tables of a SQLite database
+    (lecture_4's school.db schema), so data can outgrow memory and is
+    shared with the lecture_4 reports.
+
+    Averages, overall statistics and the top performers are read from
+    lecture_4's trigger-maintained student_stats table, not computed in
+    Python. New grades are buffered and inserted in batches of
+    `batch_size` with one commit; every read flushes first. Name lookups
+    use a NOCASE index (case-insensitive for ASCII only).
+    """
+
+    # Individual grades stay in the database
+    keep_grades = False
+    # The grades.grade column is an INTEGER from 1 to 100; other grades
+    # are rejected and reported (see ingest.grade_entries)
+    grade_range = (1, 100)
+    whole_grades = True
+
+    def __init__(self, db_path='school.db', subject=DEFAULT_SUBJECT,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.db_path = db_path
+        self.subject = subject
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(db_path)
+        ensure_schema(self.conn)
+        self._pending = []
+        # (graded, highest, lowest, overall), cleared on every new grade
+        self._summary = None
+
+    def flush(self):
+        """Insert buffered grades and commit"""
+        if self._pending:
+            self.conn.executemany(
+                "INSERT INTO grades (student_id, subject, grade) VALUES (?, ?, ?)",
+                self._pending)
+            self._pending = []
+        self.conn.commit()
+
+    def _query(self, sql, params=()):
+        self.flush()
+        return self.conn.execute(sql, params)
+
+    def get(self, name):
+        row = self.conn.execute(FIND_SQL, (name,)).fetchone()
+        return SQLiteStudent(self, row[0], row[1]) if row else None
+
+    def add(self, name):
+        if self.get(name) is not None:
+            return None
+        cursor = self.conn.execute(
+            "INSERT INTO students (full_name, birth_year) VALUES (?, NULL)", (name,))
+        return SQLiteStudent(self, cursor.lastrowid, name, None)
+
+    def add_grades(self, record, grades):
+        rows = []
+        for grade in grades:
+            grade = parse_grade(grade, self.grade_range, self.whole_grades)
+            rows.append((record.id, self.subject, int(grade)))
+        if not rows:
+            return
+        self._pending.extend(rows)
+        record._average = _UNKNOWN
+        self._summary = None
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def student_average(self, student_id):
+        row = self._query("SELECT avg_grade FROM student_stats WHERE student_id = ?",
+                          (student_id,)).fetchone()
+        return row[0] if row else None
+
+    def _statistics(self):
+        if self._summary is None:
+            self._summary = self._query(SUMMARY_SQL).fetchone()
+        return self._summary
+
+    def top(self, n=1):
+        return [(SQLiteStudent(self, student_id, name, average), average)
+                for student_id, name, average in self._query(TOP_SQL, (n,))]
+
+    def highest_average(self):
+        return self._statistics()[1]
+
+    def lowest_average(self):
+        return self._statistics()[2]
+
+    def overall_average(self):
+        return self._statistics()[3]
+
+    @property
+    def graded(self):
+        return self._statistics()[0]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __iter__(self):
+        # Streamed from the cursor, not materialized
+        for student_id, name, average in self._query(STUDENTS_SQL):
+            yield SQLiteStudent(self, student_id, name, average)
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM students").fetchone()[0]
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """
+    Where the analyzer keeps students and grades. Implementations:
+    StudentStore (memory) and SQLiteStorage (a school.db-style database).
+
+    Student records returned by get/add/iteration/top expose `name` and
+    `average` (None without grades) and are handed back to add_grades.
+    Students iterate in insertion order; name lookups are case-insensitive.
+    A backend missing any abstract method can't be instantiated.
+    """
+
+    # Whether records carry their individual grades (`record.grades`)
+    keep_grades = False
+
+    # Inclusive range of grades the backend can store, and whether they
+    # must be whole numbers
+    grade_range = (0, 100)
+    whole_grades = False
+
+    @abstractmethod
+    def get(self, name):
+        """Find student by name (case-insensitive), or None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, name):
+        """Add and return a new student; None if the name is taken"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_grades(self, record, grades):
+        """Append several grades to a student"""
+        raise NotImplementedError
+
+    def add_grade(self, record, grade):
+        """Append one grade"""
+        self.add_grades(record, (grade,))
+
+    @abstractmethod
+    def top(self, n=1):
+        """The n best averages as [(record, average)], ties included"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def highest_average(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def lowest_average(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def overall_average(self):
+        """Mean of the per-student averages, over students with grades"""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def graded(self):
+        """Number of students with at least one grade"""
+        raise NotImplementedError
+
+    def close(self):
+        """Write out anything pending and release resources"""
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    @abstractmethod
+    def __iter__(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self):
+        raise NotImplementedError
@@ -0,0 +1,238 @@
+from array import array
+from heapq import heapify, heappop, heappush
+
+from storage import StorageBackend
+
+
+class StudentRecord:
+    """
+    One student: display name, grades packed as C doubles and a running
+    total/count, so the average is O(1). `grades` is None when the store
+    keeps aggregates only.
+    """
+    __slots__ = ("name", "grades", "total", "count", "position")
+
+    def __init__(self, name, position, keep_grades=True):
+        self.name = name
+        self.grades = array('d') if keep_grades else None
+        self.total = 0.0
+        self.count = 0
+        self.position = position
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+
+class StudentStore(StorageBackend):
+    """
+    Students in insertion order, indexed by casefolded name so lookups
+    and duplicate checks are O(1) instead of a scan over every student.
+
+    Averages are kept current as grades arrive: per-student running
+    totals and class-wide aggregates. Max/min heaps of (average, position)
+    serve top-N and lowest-average queries without a full pass; each is
+    built by the first query that needs it and maintained from then on,
+    so a store that is only filled carries no heap at all. An entry whose
+    average no longer matches its student's is stale; stale entries are
+    pruned when reached and compacted once they outnumber live ones.
+
+    With keep_grades=False individual grades are not stored, so memory
+    depends on the number of students only (for streaming ingest).
+
+    When `journal` is a list, every new student and grade batch is
+    appended to it as (name, grades) so a snapshot can save only changes.
+    """
+
+    def __init__(self, keep_grades=True):
+        self.keep_grades = keep_grades
+        self.journal = None
+        self._records = []
+        self._index = {}
+        self._max_heap = None   # (-average, position), built on first use
+        self._min_heap = None   # (average, position), built on first use
+        self._average_sum = 0.0
+        self._graded = 0
+        # Saved columns not yet turned into records (see restore)
+        self._pending = None
+
+    @staticmethod
+    def key(name):
+        return name.casefold()
+
+    def get(self, name):
+        """Find student by name (case-insensitive), or None"""
+        if self._pending is not None:
+            self._materialize()
+        return self._index.get(self.key(name))
+
+    def add(self, name):
+        """Add and return a new student; None if the name is taken"""
+        if self._pending is not None:
+            self._materialize()
+        key = self.key(name)
+        if key in self._index:
+            return None
+        record = StudentRecord(name, len(self._records), self.keep_grades)
+        self._index[key] = record
+        self._records.append(record)
+        if self.journal is not None:
+            self.journal.append((name, ()))
+        return record
+
+    @classmethod
+    def restore(cls, names, totals, offsets, grades):
+        """
+        A store over saved columns: student i is names[i] with running
+        total totals[i] and grades[offsets[i]:offsets[i + 1]]. Columns may
+        be read-only buffers (e.g. memoryviews of a mapped snapshot).
+
+        Nothing is built until the store is first used, so restoring is
+        O(1); records and index are then built in one pass, and a
+        student's grade view is copied the first time a grade is added.
+        """
+        store = cls()
+        store._pending = (names, totals, offsets, grades)
+        return store
+
+    def _materialize(self):
+        names, totals, offsets, grades = self._pending
+        self._pending = None
+        records = self._records
+        index = self._index
+        key = self.key
+        average_sum = 0.0
+        graded = 0
+        for position, (name, total) in enumerate(zip(names, totals)):
+            start, end = offsets[position], offsets[position + 1]
+            record = StudentRecord.__new__(StudentRecord)
+            record.name = name
+            record.grades = grades[start:end]
+            record.total = total
+            record.count = end - start
+            record.position = position
+            records.append(record)
+            index[key(name)] = record
+            if end > start:
+                average_sum += total / (end - start)
+                graded += 1
+        self._average_sum = average_sum
+        self._graded = graded
+
+    def add_grades(self, record, grades):
+        """Append several grades with one aggregate/heap update"""
+        if self.journal is not None:
+            grades = tuple(grades)
+            self.journal.append((record.name, grades))
+        if record.grades is not None and not isinstance(record.grades, array):
+            # Restored from a snapshot: copy the read-only view on first write
+            record.grades = array('d', record.grades)
+        old_average = record.average
+        for grade in grades:
+            record.total += grade
+            record.count += 1
+            if record.grades is not None:
+                record.grades.append(grade)
+        new_average = record.average
+        if new_average is None or new_average == old_average:
+            return
+
+        if old_average is None:
+            self._graded += 1
+        else:
+            self._average_sum -= old_average
+        self._average_sum += new_average
+
+        limit = 2 * self._graded + 64
+        if self._max_heap is not None:
+            heappush(self._max_heap, (-new_average, record.position))
+            if len(self._max_heap) > limit:
+                self._compact(self._max_heap, -1)
+        if self._min_heap is not None:
+            heappush(self._min_heap, (new_average, record.position))
+            if len(self._min_heap) > limit:
+                self._compact(self._min_heap, 1)
+
+    def _heap(self, sign):
+        """The max (sign -1) or min (sign 1) heap, built on first use"""
+        if self._pending is not None:
+            self._materialize()
+        name = '_max_heap' if sign < 0 else '_min_heap'
+        heap = getattr(self, name)
+        if heap is None:
+            heap = [(sign * record.total / record.count, record.position)
+                    for record in self._records if record.count]
+            heapify(heap)
+            setattr(self, name, heap)
+        return heap
+
+    def _compact(self, heap, sign):
+        """Drop stale and duplicate entries once they outnumber live ones"""
+        records = self._records
+        heap[:] = {entry for entry in heap if sign * entry[0] == records[entry[1]].average}
+        heapify(heap)
+
+    def _peek(self, heap, sign):
+        records = self._records
+        while heap and sign * heap[0][0] != records[heap[0][1]].average:
+            heappop(heap)
+        return heap[0] if heap else None
+
+    def top(self, n=1):
+        """
+        The n best averages as [(record, average)], best first, extended
+        with every student tied with the n-th. Ties keep insertion order.
+        O((n + ties + stale entries) log students), plus one pass over
+        the students the first time.
+        """
+        heap = self._heap(-1)
+        taken = []
+        seen = set()
+        while self._peek(heap, -1) is not None:
+            if len(taken) >= n and heap[0][0] != taken[-1][0]:
+                break
+            entry = heappop(heap)
+            # A student whose average returned to an earlier value has two
+            # live entries; report it once
+            if entry[1] not in seen:
+                seen.add(entry[1])
+                taken.append(entry)
+        for entry in taken:
+            heappush(heap, entry)
+        return [(self._records[position], -average) for average, position in taken]
+
+    def lowest_average(self):
+        entry = self._peek(self._heap(1), 1)
+        return entry[0] if entry else None
+
+    def highest_average(self):
+        entry = self._peek(self._heap(-1), -1)
+        return -entry[0] if entry else None
+
+    def overall_average(self):
+        """Mean of the per-student averages, over students with grades"""
+        if self._pending is not None:
+            self._materialize()
+        return self._average_sum / self._graded if self._graded else None
+
+    @property
+    def graded(self):
+        """Number of students with at least one grade"""
+        if self._pending is not None:
+            self._materialize()
+        return self._graded
+
+    def __contains__(self, name):
+        if self._pending is not None:
+            self._materialize()
+        return self.key(name) in self._index
+
+    def __iter__(self):
+        if self._pending is not None:
+            self._materialize()
+        return iter(self._records)
+
+    def __len__(self):
+        if self._pending is not None:
+            return len(self._pending[0])
+        return len(self._records)
@@ -0,0 +1,73 @@
+"""
+Snapshot and change log round trips.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import Snapshot, log_path
+
+
+def contents(store):
+    return [(student.name, list(student.grades)) for student in store]
+
+
+def test_log_changes_round_trip(tmp_path):
+    path = str(tmp_path / "grades.snap")
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add_grades(store.add("Alice"), [90, 80])
+    assert snapshot.save(store) == "snapshot"
+
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add_grades(store.get("alice"), [70])
+    store.add("Bob")
+    assert snapshot.save(store) == "log"
+
+    assert contents(Snapshot(path).load()) == [("Alice", [90.0, 80.0, 70.0]), ("Bob", [])]
+
+
+def test_append_after_torn_record(tmp_path):
+    path = str(tmp_path / "grades.snap")
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add_grades(store.add("Alice"), [90, 80])
+    snapshot.save(store)
+
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add_grades(store.get("Alice"), [70])
+    snapshot.save(store)
+    # Simulate a crash part way through writing that record
+    with open(log_path(path), 'r+b') as f:
+        f.truncate(os.path.getsize(log_path(path)) - 4)
+
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    assert contents(store) == [("Alice", [90.0, 80.0])]
+    store.add_grades(store.add("Bob"), [50])
+    assert snapshot.save(store) == "log"
+
+    assert contents(Snapshot(path).load()) == [("Alice", [90.0, 80.0]), ("Bob", [50.0])]
+
+
+def test_stale_log_is_replaced(tmp_path):
+    path = str(tmp_path / "grades.snap")
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add("Alice")
+    snapshot.save(store)
+    with open(log_path(path), 'wb') as f:
+        f.write(b"not a log of this snapshot")
+
+    snapshot = Snapshot(path)
+    store = snapshot.load()
+    store.add_grades(store.get("Alice"), [60])
+    snapshot.save(store)
+
+    assert contents(Snapshot(path).load()) == [("Alice", [60.0])]
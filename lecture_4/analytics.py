@@ -0,0 +1,125 @@
+import argparse
+import json
+import math
+import sqlite3
+
+from summary_stats import GRADE_BANDS
+
+PERCENTILES = (50, 90, 99)
+
+# Grades are integers in 1..100, so one GROUP BY over grades gives an exact
+# frequency table per subject. Every statistic below, percentiles included,
+# is then computed from at most 100 buckets per subject instead of from
+# the rows themselves: one pass over `grades`, no sort of the full column.
+FREQUENCIES_SQL = """
+    SELECT subject, grade, COUNT(*)
+    FROM grades
+    GROUP BY subject, grade
+"""
+
+
+def _percentile(frequencies, count, p):
+    """Linearly interpolated percentile over sorted (grade, count) pairs"""
+    rank = p / 100 * (count - 1)
+    lower_rank, upper_rank = math.floor(rank), math.ceil(rank)
+    lower = upper = None
+    seen = 0
+    for grade, n in frequencies:
+        seen += n
+        if lower is None and seen > lower_rank:
+            lower = grade
+        if seen > upper_rank:
+            upper = grade
+            break
+    return lower + (upper - lower) * (rank - lower_rank)
+
+
+def summarize(frequencies):
+    """
+    Statistics for one group from {grade: count}: count, min, max, mean,
+    stddev (population), p50/p90/p99 and the letter-grade histogram
+    """
+    pairs = sorted(frequencies.items())
+    count = sum(n for _, n in pairs)
+    histogram = {label: 0 for label, _ in GRADE_BANDS}
+    if not count:
+        return {'count': 0, 'min': None, 'max': None, 'mean': None, 'stddev': None,
+                'percentiles': {p: None for p in PERCENTILES}, 'histogram': histogram}
+
+    total = sum(grade * n for grade, n in pairs)
+    total_squares = sum(grade * grade * n for grade, n in pairs)
+    mean = total / count
+    # Integer sums keep this exact; max() guards float rounding at zero
+    variance = max(total_squares / count - mean * mean, 0.0)
+
+    for grade, n in pairs:
+        for label, low in GRADE_BANDS:
+            if grade >= low:
+                histogram[label] += n
+                break
+
+    return {
+        'count': count,
+        'min': pairs[0][0],
+        'max': pairs[-1][0],
+        'mean': mean,
+        'stddev': math.sqrt(variance),
+        'percentiles': {p: _percentile(pairs, count, p) for p in PERCENTILES},
+        'histogram': histogram,
+    }
+
+
+def grade_analytics(conn):
+    """
+    Grade statistics per subject and overall, from one scan of `grades`.
+    Returns {'overall': stats, 'subjects': {subject: stats}}; see summarize().
+    """
+    by_subject = {}
+    overall = {}
+    for subject, grade, n in conn.execute(FREQUENCIES_SQL):
+        by_subject.setdefault(subject, {})[grade] = n
+        overall[grade] = overall.get(grade, 0) + n
+    return {
+        'overall': summarize(overall),
+        'subjects': {subject: summarize(frequencies)
+                     for subject, frequencies in sorted(by_subject.items())},
+    }
+
+
+def print_subject_table(analytics):
+    """Print one row of statistics per subject"""
+    percentile_headers = " ".join(f"{'p' + str(p):>6}" for p in PERCENTILES)
+    print(f"  {'subject':<20} {'count':>7} {'min':>4} {'max':>4} {'mean':>7} {'stddev':>7} "
+          f"{percentile_headers}")
+    for subject, stats in analytics['subjects'].items():
+        percentiles = " ".join(f"{stats['percentiles'][p]:>6.1f}" for p in PERCENTILES)
+        print(f"  {subject:<20} {stats['count']:>7} {stats['min']:>4} {stats['max']:>4} "
+              f"{stats['mean']:>7.2f} {stats['stddev']:>7.2f} {percentiles}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade distribution and percentile analytics")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--json', action='store_true', help="Print the result as JSON")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    analytics = grade_analytics(conn)
+    conn.close()
+
+    if args.json:
+        print(json.dumps(analytics, indent=2))
+        return
+
+    overall = analytics['overall']
+    if not overall['count']:
+        print("No grades found")
+        return
+    print(f"Overall: {overall['count']} grades, mean {overall['mean']:.2f}, "
+          f"stddev {overall['stddev']:.2f}, "
+          + ", ".join(f"p{p} {overall['percentiles'][p]:.1f}" for p in PERCENTILES))
+    print_subject_table(analytics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+
+from schema_builder import schema_statements
+from summary_stats import drop_summary_triggers, restore_summary_triggers
+
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def iter_records(path):
+    """
+    Stream dict records from a .csv or .ndjson/.jsonl file. A malformed
+    NDJSON line yields None, so it is counted as a rejected row.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if extension == '.csv':
+            yield from csv.DictReader(f)
+        elif extension in ('.ndjson', '.jsonl'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield None
+        else:
+            raise ValueError(f"Unsupported file type: {path} (use .csv, .ndjson or .jsonl)")
+
+
+def student_rows(records, stats):
+    """Convert student records to (id, full_name, birth_year) tuples"""
+    for record in records:
+        if not isinstance(record, dict):
+            stats['rejected'] += 1
+            continue
+        try:
+            student_id = record.get('id')
+            student_id = int(student_id) if student_id not in (None, '') else None
+            full_name = str(record['full_name']).strip()
+            birth_year = int(record['birth_year'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            stats['rejected'] += 1
+            continue
+        if not full_name:
+            stats['rejected'] += 1
+            continue
+        yield student_id, full_name, birth_year
+
+
+def grade_rows(records, stats):
+    """Convert grade records to (student_id, subject, grade) tuples"""
+    for record in records:
+        if not isinstance(record, dict):
+            stats['rejected'] += 1
+            continue
+        try:
+            student_id = int(record['student_id'])
+            subject = str(record['subject']).strip()
+            grade = float(record['grade'])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            stats['rejected'] += 1
+            continue
+        # Mirror the CHECK constraint so one bad row can't abort a batch;
+        # fractional and non-finite grades are bad rows, not truncated
+        if not subject or not grade.is_integer() or not 1 <= grade <= 100:
+            stats['rejected'] += 1
+            continue
+        yield student_id, subject, int(grade)
+
+
+def _insert_batches(conn, sql, rows, batch_size, stats):
+    """
+    executemany in batches of batch_size rows, one transaction each.
+    Rows an INSERT OR IGNORE skips (e.g. an id already taken) are
+    counted as rejected.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _insert_batch(conn, sql, batch, stats)
+            batch = []
+    if batch:
+        _insert_batch(conn, sql, batch, stats)
+
+
+def _insert_batch(conn, sql, batch, stats):
+    with conn:
+        inserted = conn.executemany(sql, batch).rowcount
+    stats['loaded'] += inserted
+    stats['rejected'] += len(batch) - inserted
+
+
+def ensure_schema(conn, base_dir='.'):
+    """
+    Create the tables and indexes of schema.sql that are missing, so a
+    load appends to an existing database instead of replacing it
+    """
+    tables, indexes = schema_statements(base_dir)
+    with conn:
+        for sql in tables + list(indexes.values()):
+            conn.execute(sql)
+
+
+def table_indexes(conn):
+    """{name: CREATE sql} of the explicit indexes on students and grades, as stored"""
+    return dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name IN ('students', 'grades') AND sql IS NOT NULL"
+    ))
+
+
+def bulk_load(db_path='school.db', students_path=None, grades_path=None,
+              batch_size=DEFAULT_BATCH_SIZE, base_dir='.'):
+    """
+    Append students and grades from CSV/NDJSON files to the database.
+
+    Indexes and summary triggers are dropped for the load and rebuilt
+    afterwards (indexes from their own stored SQL, so the database keeps
+    exactly the indexes it had), and journaling/fsync are relaxed for its
+    duration, then restored.
+    Returns per-table stats: loaded, rejected, seconds, rows_per_sec.
+    """
+    conn = sqlite3.connect(db_path)
+    results = {}
+
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    ensure_schema(conn, base_dir)
+    indexes = table_indexes(conn)
+
+    try:
+
+        # Relax durability for the load: an in-memory journal keeps ROLLBACK
+        # working, but a crash mid-load may corrupt the file
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-200000")
+
+        for name in indexes:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        # Per-row summary triggers are replaced by one rebuild after the load
+        drop_summary_triggers(conn)
+
+        if students_path:
+            results['students'] = _load_table(
+                conn,
+                # Existing students are kept; rows with a taken id are rejected
+                "INSERT OR IGNORE INTO students (id, full_name, birth_year) VALUES (?, ?, ?)",
+                student_rows, students_path, batch_size,
+            )
+        if grades_path:
+            results['grades'] = _load_table(
+                conn,
+                "INSERT INTO grades (student_id, subject, grade) VALUES (?, ?, ?)",
+                grade_rows, grades_path, batch_size,
+            )
+
+    finally:
+        # Rebuild indexes even if a load failed part way
+        start = time.perf_counter()
+        with conn:
+            for create_sql in indexes.values():
+                conn.execute(create_sql)
+        results['index_seconds'] = round(time.perf_counter() - start, 2)
+
+        start = time.perf_counter()
+        restore_summary_triggers(conn)
+        results['summary_seconds'] = round(time.perf_counter() - start, 2)
+
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.close()
+
+    return results
+
+
+def _load_table(conn, sql, to_rows, path, batch_size):
+    stats = {'loaded': 0, 'rejected': 0}
+    start = time.perf_counter()
+    _insert_batches(conn, sql, to_rows(iter_records(path), stats), batch_size, stats)
+    elapsed = time.perf_counter() - start
+    stats['seconds'] = round(elapsed, 2)
+    stats['rows_per_sec'] = round(stats['loaded'] / elapsed) if elapsed else stats['loaded']
+    return stats
+
+
+def print_load_report(results):
+    """Print the stats returned by bulk_load"""
+    print("✓ Bulk load finished:")
+    for table in ('students', 'grades'):
+        if table in results:
+            stats = results[table]
+            print(f"  • {table}: {stats['loaded']} rows loaded, {stats['rejected']} rejected "
+                  f"in {stats['seconds']}s ({stats['rows_per_sec']} rows/sec)")
+    print(f"  • Index rebuild: {results['index_seconds']}s")
+    print(f"  • Summary tables rebuild: {results['summary_seconds']}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load students and grades into school.db")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--students', help="Students file (.csv/.ndjson): [id,]full_name,birth_year")
+    parser.add_argument('--grades', help="Grades file (.csv/.ndjson): student_id,subject,grade")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not args.students and not args.grades:
+        parser.error("nothing to load: pass --students and/or --grades")
+
+    print_load_report(bulk_load(args.db, args.students, args.grades, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import atexit
+import sqlite3
+
+# One connection per database file per process. Reusing it keeps sqlite3's
+# per-connection statement cache warm, so a query registered in
+# task_queries.TASK_QUERIES is parsed once and then only re-bound.
+CACHED_STATEMENTS = 256
+
+# Session-level tuning only; nothing here changes the database file
+PRAGMAS = {
+    'cache_size': -64000,      # 64 MB page cache
+    'temp_store': 'MEMORY',    # ORDER BY / DISTINCT temp B-trees in RAM
+    'mmap_size': 268435456,    # read pages through a 256 MB mapping
+}
+
+_connections = {}
+_initialized = set()
+
+
+def get_connection(db_path='school.db', init=None):
+    """
+    Return the shared connection for db_path, opening and tuning it on
+    first use. `init(conn)` (e.g. ensure_summary_tables) runs once per
+    connection, not once per call.
+    """
+    conn = _connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, cached_statements=CACHED_STATEMENTS)
+        for pragma, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        _connections[db_path] = conn
+    if init is not None and (db_path, init) not in _initialized:
+        init(conn)
+        _initialized.add((db_path, init))
+    return conn
+
+
+def close_connection(db_path='school.db'):
+    """Close the shared connection, e.g. before the file is replaced"""
+    conn = _connections.pop(db_path, None)
+    if conn is not None:
+        conn.close()
+    for key in [key for key in _initialized if key[0] == db_path]:
+        _initialized.discard(key)
+
+
+def close_all():
+    for db_path in list(_connections):
+        close_connection(db_path)
+
+
+atexit.register(close_all)
@@ -0,0 +1,121 @@
+import argparse
+import csv
+import gzip
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from summary_stats import ensure_summary_tables
+from task_queries import TASK_QUERIES, task_query
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Table exports: (file stem, header row, SQL)
+TABLE_EXPORTS = [
+    ('students', ['ID', 'Full Name', 'Birth Year'],
+     "SELECT * FROM students ORDER BY id"),
+    ('grades', ['ID', 'Student Name', 'Subject', 'Grade'],
+     """SELECT g.id, s.full_name, g.subject, g.grade
+        FROM grades g
+        JOIN students s ON g.student_id = s.id
+        ORDER BY s.full_name, g.subject"""),
+]
+
+
+def _open_output(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def export_query(db_path, sql, out_path, header=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 compress=False, params=(), conn=None):
+    """
+    Stream one query to a CSV file, fetchmany(chunk_size) rows at a time.
+    Without `conn` it opens its own read-only connection, so several
+    exports can run at once. Returns the number of rows written.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows_written = 0
+    try:
+        cursor = conn.execute(sql, params)
+        if header is None:
+            header = [description[0] for description in cursor.description]
+        with _open_output(out_path, compress) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                rows_written += len(rows)
+    finally:
+        if own_conn:
+            conn.close()
+    return rows_written
+
+
+def export_tables(db_path='school.db', chunk_size=DEFAULT_CHUNK_SIZE, compress=False,
+                  conn=None):
+    """
+    Export students.csv and grades.csv (".csv.gz" when compressed).
+    Runs concurrently on one connection each, or one after the other on
+    `conn` when given. Returns {file name: rows written}.
+    """
+    suffix = '.csv.gz' if compress else '.csv'
+    if conn is not None:
+        return {
+            stem + suffix: export_query(db_path, sql, stem + suffix, header, chunk_size,
+                                        compress, conn=conn)
+            for stem, header, sql in TABLE_EXPORTS
+        }
+    with ThreadPoolExecutor(max_workers=len(TABLE_EXPORTS)) as pool:
+        futures = {
+            stem + suffix: pool.submit(
+                export_query, db_path, sql, stem + suffix, header, chunk_size, compress
+            )
+            for stem, header, sql in TABLE_EXPORTS
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def export_task_query(name, db_path='school.db', out_path=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE, compress=False, params=None):
+    """Export one task query (see task_queries.TASK_QUERIES) by name"""
+    _, sql, params = task_query(name, params)
+
+    # Some task queries read the summary tables; make sure they exist
+    conn = sqlite3.connect(db_path)
+    ensure_summary_tables(conn)
+    conn.close()
+
+    out_path = out_path or name + ('.csv.gz' if compress else '.csv')
+    return out_path, export_query(db_path, sql, out_path, chunk_size=chunk_size,
+                                  compress=compress, params=params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming CSV export from school.db")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--query', choices=list(TASK_QUERIES),
+                        help="Export one task query instead of the students/grades tables")
+    parser.add_argument('--param', action='append', dest='params',
+                        help="Bound parameter for --query (repeat for several)")
+    parser.add_argument('--output', help="Output file for --query")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--gzip', action='store_true', help="Write gzip-compressed CSV")
+    args = parser.parse_args()
+
+    if args.query:
+        path, count = export_task_query(args.query, args.db, args.output,
+                                        args.chunk_size, args.gzip, args.params)
+        print(f"✓ {path}: {count} records")
+    else:
+        for path, count in export_tables(args.db, args.chunk_size, args.gzip).items():
+            print(f"✓ {path}: {count} records")
+
+
+if __name__ == "__main__":
+    main()
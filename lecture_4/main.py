@@ -1,41 +1,48 @@
-import sqlite3
 import os
 
+from bulk_load import bulk_load, print_load_report
+from summary_stats import ensure_summary_tables
+from task_queries import TASK_QUERIES, task_query
+from connection import get_connection, close_connection
+from schema_builder import build_database, is_up_to_date, record_build
+from export import export_tables
+from query_plans import advise, print_advice
+from parallel_queries import run_parallel, print_timings
+from analytics import PERCENTILES, grade_analytics, print_subject_table
+
 def create_database_from_sql():
-    """Creates database from SQL file"""
-    
-    # Remove existing database (if starting fresh)
-    if os.path.exists('school.db'):
-        os.remove('school.db')
-        print("Old database removed")
-    
-    # Create database connection
-    conn = sqlite3.connect('school.db')
-    cursor = conn.cursor()
-    
-    print("Creating database 'school.db' from queries.sql...")
+    """Creates or incrementally updates the database from schema.sql and seed.sql"""
+    print("Building database 'school.db' from schema.sql and seed.sql...")
     
     try:
-        # Read SQL file
-        with open('queries.sql', 'r', encoding='utf-8') as f:
-            sql_script = f.read()
+        # Skips unchanged sections and applies new statements; never
+        # deletes an existing database
+        result = build_database('school.db')
         
-        # Execute the entire SQL script
-        cursor.executescript(sql_script)
-        conn.commit()
+        # Shared connection, reused by the other steps
+        conn = get_connection('school.db', init=ensure_summary_tables)
+        cursor = conn.cursor()
         
-        print("✓ Database successfully created and populated!")
+        if result['action'] == 'unchanged':
+            print("✓ Database is up to date (schema.sql and seed.sql unchanged)")
+        elif result['action'] == 'incremental':
+            print(f"✓ Database updated: {result['applied']} new statements applied, "
+                  f"{result['dropped']} changed indexes recreated")
+        elif result['action'] == 'adopted':
+            print(f"✓ Existing database kept: {result['applied']} missing statements applied")
+        else:
+            print("✓ Database successfully created and populated!")
         print(f"  Total students: {cursor.execute('SELECT COUNT(*) FROM students').fetchone()[0]}")
         print(f"  Total grades: {cursor.execute('SELECT COUNT(*) FROM grades').fetchone()[0]}")
+        for section in result['outdated']:
+            print(f"  • {section}.sql was edited in a way that can't be applied in place; "
+                  f"run 'python schema_builder.py --force' to rebuild")
         
     except Exception as e:
         print(f"✗ Error creating database: {e}")
-        conn.rollback()
+        close_connection('school.db')
         return False
     
-    finally:
-        conn.close()
-    
     return True
 
 def execute_task_queries():
@@ -45,62 +52,20 @@ def execute_task_queries():
         print("Please run create_database_from_sql() first")
         return
     
-    conn = sqlite3.connect('school.db')
+    conn = get_connection('school.db', init=ensure_summary_tables)
     cursor = conn.cursor()
     
     print("\n" + "=" * 70)
     print("EXECUTING REQUIRED QUERIES FROM TASK:")
     print("=" * 70)
     
-    # Queries from the task
-    queries = [
-        ("1. All grades for Alice Johnson",
-         """SELECT s.full_name, g.subject, g.grade 
-            FROM students s 
-            JOIN grades g ON s.id = g.student_id 
-            WHERE s.full_name = 'Alice Johnson'"""),
-        
-        ("\n2. Average grade per student",
-         """SELECT s.full_name, ROUND(AVG(g.grade), 2) as avg_grade 
-            FROM students s 
-            JOIN grades g ON s.id = g.student_id 
-            GROUP BY s.id, s.full_name 
-            ORDER BY avg_grade DESC"""),
-        
-        ("\n3. Students born after 2004",
-         """SELECT full_name, birth_year 
-            FROM students 
-            WHERE birth_year > 2004 
-            ORDER BY birth_year"""),
-        
-        ("\n4. Subjects and their average grades",
-         """SELECT subject, ROUND(AVG(grade), 2) as avg_grade 
-            FROM grades 
-            GROUP BY subject 
-            ORDER BY avg_grade DESC"""),
-        
-        ("\n5. Top 3 students with highest average grades",
-         """SELECT s.full_name, ROUND(AVG(g.grade), 2) as avg_grade 
-            FROM students s 
-            JOIN grades g ON s.id = g.student_id 
-            GROUP BY s.id, s.full_name 
-            ORDER BY avg_grade DESC 
-            LIMIT 3"""),
-        
-        ("\n6. Students who scored below 80 in any subject",
-         """SELECT DISTINCT s.full_name, g.subject, g.grade 
-            FROM students s 
-            JOIN grades g ON s.id = g.student_id 
-            WHERE g.grade < 80 
-            ORDER BY s.full_name, g.grade""")
-    ]
-    
-    for title, query in queries:
-        print(title)
+    for position, name in enumerate(TASK_QUERIES):
+        title, query, params = task_query(name)
+        print(("\n" if position else "") + title)
         print("-" * 50)
         
         try:
-            cursor.execute(query)
+            cursor.execute(query, params)
             results = cursor.fetchall()
             
             if results:
@@ -116,8 +81,6 @@ def execute_task_queries():
                 
         except Exception as e:
             print(f"Query execution error: {e}")
-    
-    conn.close()
 
 def show_database_summary():
     """Shows database summary information"""
@@ -125,7 +88,7 @@ def show_database_summary():
         print("Database not found!")
         return
     
-    conn = sqlite3.connect('school.db')
+    conn = get_connection('school.db', init=ensure_summary_tables)
     cursor = conn.cursor()
     
     print("\n" + "=" * 70)
@@ -145,18 +108,20 @@ def show_database_summary():
         cursor.execute("SELECT id, full_name, birth_year FROM students ORDER BY full_name")
         students = cursor.fetchall()
         for student in students:
-            print(f"  {student[0]}. {student[1]} (born {student[2]})")
+            born = student[2] if student[2] is not None else "unknown"
+            print(f"  {student[0]}. {student[1]} (born {born})")
         
         # Show grade statistics
         print(f"\nGrade statistics:")
+        # Totals come from subject_stats; MIN/MAX are idx_grade lookups
         cursor.execute("""
             SELECT 
-                COUNT(*) as total_grades,
-                MIN(grade) as min_grade,
-                MAX(grade) as max_grade,
-                ROUND(AVG(grade), 2) as avg_grade,
-                COUNT(DISTINCT subject) as subjects_count
-            FROM grades
+                COALESCE(SUM(grade_count), 0) as total_grades,
+                (SELECT MIN(grade) FROM grades) as min_grade,
+                (SELECT MAX(grade) FROM grades) as max_grade,
+                ROUND(SUM(grade_sum) * 1.0 / SUM(grade_count), 2) as avg_grade,
+                COUNT(*) as subjects_count
+            FROM subject_stats
         """)
         stats = cursor.fetchone()
         print(f"  • Total grades: {stats[0]}")
@@ -165,32 +130,35 @@ def show_database_summary():
         print(f"  • Maximum grade: {stats[2]}")
         print(f"  • Average grade: {stats[3]}")
         
+        # Spread and percentiles need the grades themselves: one index-only pass
+        analytics = grade_analytics(conn)
+        overall = analytics['overall']
+        if overall['count']:
+            print(f"  • Standard deviation: {overall['stddev']:.2f}")
+            print("  • Percentiles: " + ", ".join(
+                f"p{p} = {overall['percentiles'][p]:.1f}" for p in PERCENTILES))
+        
         # Show grade distribution
         print(f"\nGrade distribution:")
         cursor.execute("""
             SELECT 
-                CASE 
-                    WHEN grade >= 90 THEN 'A (90-100)'
-                    WHEN grade >= 80 THEN 'B (80-89)'
-                    WHEN grade >= 70 THEN 'C (70-79)'
-                    WHEN grade >= 60 THEN 'D (60-69)'
-                    ELSE 'F (below 60)'
-                END as grade_range,
-                COUNT(*) as count,
-                ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM grades), 1) as percentage
-            FROM grades
-            GROUP BY grade_range
-            ORDER BY MIN(grade) DESC
+                band as grade_range,
+                grade_count as count,
+                ROUND(grade_count * 100.0 / (SELECT SUM(grade_count) FROM grade_band_stats), 1) as percentage
+            FROM grade_band_stats
+            WHERE grade_count > 0
+            ORDER BY min_grade DESC
         """)
         distribution = cursor.fetchall()
         for row in distribution:
             print(f"  • {row[0]}: {row[1]} grades ({row[2]}%)")
         
+        if analytics['subjects']:
+            print(f"\nPer-subject statistics:")
+            print_subject_table(analytics)
+        
     except Exception as e:
         print(f"Error: {e}")
-    
-    finally:
-        conn.close()
 
 def run_sql_file_directly():
     """Executes SQL file directly using SQLite command line"""
@@ -202,6 +170,11 @@ def run_sql_file_directly():
         print("Error: queries.sql file not found!")
         return
     
+    if is_up_to_date('school.db'):
+        print("✓ school.db is up to date with schema.sql and seed.sql; nothing to run")
+        return
+    
+    close_connection('school.db')
     if os.path.exists('school.db'):
         os.remove('school.db')
     
@@ -214,8 +187,9 @@ def run_sql_file_directly():
         if result.returncode == 0:
             print("✓ SQL file executed successfully!")
             
-            # Connect to show results
-            conn = sqlite3.connect('school.db')
+            # Record checksums so the next run can skip the rebuild
+            record_build('school.db')
+            conn = get_connection('school.db')
             cursor = conn.cursor()
             
             cursor.execute("SELECT COUNT(*) FROM students")
@@ -226,8 +200,6 @@ def run_sql_file_directly():
             
             print(f"  Students: {students}")
             print(f"  Grades: {grades}")
-            
-            conn.close()
         else:
             print("✗ Error executing SQL file:")
             print(result.stderr)
@@ -242,39 +214,62 @@ def export_query_results():
         print("Database not found!")
         return
     
-    conn = sqlite3.connect('school.db')
-    cursor = conn.cursor()
+    # Each file is streamed by its own thread over its own read-only
+    # connection; the shared connection stays with the interactive queries
+    counts = export_tables('school.db')
     
-    import csv
+    print(f"✓ Data exported to CSV files:")
+    print(f"  • students.csv: {counts['students.csv']} records")
+    print(f"  • grades.csv: {counts['grades.csv']} records")
+
+def bulk_load_from_files():
+    """Appends students and grades from CSV/NDJSON files to the database"""
+    print("\n" + "=" * 70)
+    print("BULK LOAD FROM FILES")
+    print("=" * 70)
+    
+    students_path = input("Students file (.csv/.ndjson, blank to skip): ").strip()
+    grades_path = input("Grades file (.csv/.ndjson, blank to skip): ").strip()
     
-    # Export students
-    cursor.execute("SELECT * FROM students ORDER BY id")
-    students = cursor.fetchall()
+    if not students_path and not grades_path:
+        print("Nothing to load.")
+        return
     
-    with open('students.csv', 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['ID', 'Full Name', 'Birth Year'])
-        writer.writerows(students)
+    for path in (students_path, grades_path):
+        if path and not os.path.exists(path):
+            print(f"Error: {path} not found!")
+            return
+    
+    try:
+        results = bulk_load('school.db', students_path or None, grades_path or None)
+        print_load_report(results)
+    except Exception as e:
+        print(f"✗ Error during bulk load: {e}")
+
+def show_query_plans():
+    """Runs EXPLAIN QUERY PLAN for each task query and suggests indexes"""
+    if not os.path.exists('school.db'):
+        print("Database not found!")
+        return
     
-    # Export grades
-    cursor.execute("""
-        SELECT g.id, s.full_name, g.subject, g.grade
-        FROM grades g
-        JOIN students s ON g.student_id = s.id
-        ORDER BY s.full_name, g.subject
-    """)
-    grades = cursor.fetchall()
+    print("\n" + "=" * 70)
+    print("QUERY PLAN DIAGNOSTICS")
+    print("=" * 70)
     
-    with open('grades.csv', 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['ID', 'Student Name', 'Subject', 'Grade'])
-        writer.writerows(grades)
+    print_advice(advise(get_connection('school.db', init=ensure_summary_tables)))
+
+def time_task_queries():
+    """Runs the task queries in parallel and reports per-query timing"""
+    if not os.path.exists('school.db'):
+        print("Database not found!")
+        return
     
-    conn.close()
+    print("\n" + "=" * 70)
+    print("PARALLEL TASK QUERIES WITH TIMING")
+    print("=" * 70)
     
-    print(f"✓ Data exported to CSV files:")
-    print(f"  • students.csv: {len(students)} records")
-    print(f"  • grades.csv: {len(grades)} records")
+    results, elapsed = run_parallel('school.db')
+    print_timings(results, elapsed)
 
 def main():
     """Main function"""
@@ -283,15 +278,18 @@ def main():
     print("=" * 70)
     
     print("\nOptions:")
-    print("1. Create database from SQL file")
+    print("1. Create or update database from SQL files")
     print("2. Execute task queries")
     print("3. Show database summary")
     print("4. Export data to CSV")
     print("5. Execute SQL file directly (requires SQLite3 CLI)")
     print("6. Run all operations")
+    print("7. Bulk load students/grades from CSV or NDJSON files")
+    print("8. Query plan diagnostics and index suggestions")
+    print("9. Run task queries in parallel with timing")
     
     try:
-        choice = input("\nEnter choice (1-6): ").strip()
+        choice = input("\nEnter choice (1-9): ").strip()
         
         if choice == '1':
             create_database_from_sql()
@@ -313,8 +311,14 @@ def main():
                 show_database_summary()
                 execute_task_queries()
                 export_query_results()
+        elif choice == '7':
+            bulk_load_from_files()
+        elif choice == '8':
+            show_query_plans()
+        elif choice == '9':
+            time_task_queries()
         else:
-            print("Invalid choice. Please enter 1-6.")
+            print("Invalid choice. Please enter 1-9.")
             
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user.")
@@ -0,0 +1,138 @@
+import argparse
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from connection import get_connection
+from summary_stats import ensure_summary_tables
+from task_queries import TASK_QUERIES, task_query
+
+FETCH_SIZE = 10_000
+
+
+class _ReadOnlyConnections:
+    """
+    One read-only connection per worker thread. sqlite3 releases the GIL
+    while SQLite steps a statement, so independent queries run in parallel.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.opened = []
+
+    def get(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   check_same_thread=False)
+            self.local.conn = conn
+            with self.lock:
+                self.opened.append(conn)
+        return conn
+
+    def close(self):
+        for conn in self.opened:
+            conn.close()
+        self.opened = []
+
+
+def _run_one(readers, name, params):
+    """Run one registered query to completion and time it"""
+    title, sql, params = task_query(name, params)
+    start = time.perf_counter()
+    cursor = readers.get().execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    rows = []
+    while True:
+        chunk = cursor.fetchmany(FETCH_SIZE)
+        if not chunk:
+            break
+        rows.extend(chunk)
+    seconds = time.perf_counter() - start
+    return {
+        'name': name,
+        'title': title,
+        'columns': columns,
+        'rows': rows,
+        'row_count': len(rows),
+        'seconds': seconds,
+        'rows_per_sec': len(rows) / seconds if seconds else float(len(rows)),
+    }
+
+
+def run_parallel(db_path='school.db', names=None, params=None, max_workers=None,
+                 on_result=None):
+    """
+    Run registered queries concurrently on read-only connections.
+
+    `params` maps query name -> bound parameters (defaults otherwise).
+    `on_result(result)` is called as each query finishes. Returns
+    (results in registry order, total wall seconds).
+    """
+    names = list(names or TASK_QUERIES)
+    params = params or {}
+
+    # Read-only connections can't create the summary tables, so do it up front
+    get_connection(db_path, init=ensure_summary_tables)
+
+    max_workers = max_workers or len(names)
+    readers = _ReadOnlyConnections(db_path)
+    results = {}
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_one, readers, name, params.get(name)) for name in names]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['name']] = result
+                if on_result is not None:
+                    on_result(result)
+        elapsed = time.perf_counter() - start
+    finally:
+        readers.close()
+    return [results[name] for name in names], elapsed
+
+
+def print_timings(results, elapsed):
+    """Print per-query timing and total wall time vs. the sum of queries"""
+    print(f"{'query':<22} {'rows':>9} {'time (ms)':>10} {'rows/sec':>12}")
+    print("-" * 56)
+    for result in results:
+        print(f"{result['name']:<22} {result['row_count']:>9} "
+              f"{result['seconds'] * 1000:>10.2f} {result['rows_per_sec']:>12.0f}")
+    print("-" * 56)
+    total = sum(result['seconds'] for result in results)
+    slowest = max((result['seconds'] for result in results), default=0.0)
+    print(f"Wall time: {elapsed * 1000:.2f} ms "
+          f"(sum of queries {total * 1000:.2f} ms, slowest {slowest * 1000:.2f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run task queries in parallel with timing")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--query', action='append', dest='names', choices=list(TASK_QUERIES),
+                        help="Query to run (repeat for several; default all)")
+    parser.add_argument('--workers', type=int, help="Thread pool size")
+    parser.add_argument('--show-rows', action='store_true', help="Print result rows too")
+    args = parser.parse_args()
+
+    def report(result):
+        print(f"✓ {result['name']}: {result['row_count']} rows in {result['seconds'] * 1000:.2f} ms")
+
+    results, elapsed = run_parallel(args.db, args.names, max_workers=args.workers,
+                                    on_result=report)
+    if args.show_rows:
+        for result in results:
+            print(f"\n{result['title']}")
+            print(" | ".join(result['columns']))
+            for row in result['rows']:
+                print(" | ".join(str(value) for value in row))
+    print()
+    print_timings(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from schema_builder import schema_statements
+from summary_stats import ensure_summary_tables
+from task_queries import TASK_QUERIES, task_query
+
+# Indexes the advisor may propose, tried one at a time against each query
+CANDIDATE_INDEXES = {
+    'idx_students_full_name': "CREATE INDEX idx_students_full_name ON students(full_name)",
+    'idx_grades_student_grade': "CREATE INDEX idx_grades_student_grade ON grades(student_id, grade)",
+    'idx_grades_subject_grade': "CREATE INDEX idx_grades_subject_grade ON grades(subject, grade)",
+    'idx_grades_grade_student_subject':
+        "CREATE INDEX idx_grades_grade_student_subject ON grades(grade, student_id, subject)",
+}
+
+
+def explain(conn, sql, params=()):
+    """Return EXPLAIN QUERY PLAN detail lines for a query"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def plan_issues(details):
+    """
+    Flag full table scans, temp B-trees and index lookups that still
+    need the table row. Scans over an index (ordered walks) are not
+    flagged.
+    """
+    issues = []
+    for detail in details:
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            issues.append(('full scan', detail))
+        elif 'USE TEMP B-TREE' in detail:
+            issues.append(('temp b-tree', detail))
+        elif detail.startswith('SEARCH ') and ' USING INDEX ' in detail:
+            issues.append(('non-covering index', detail))
+    return issues
+
+
+def plan_cost(issues):
+    """Comparable badness of a plan: full scans, then temp B-trees, then lookups"""
+    kinds = [kind for kind, _ in issues]
+    return (kinds.count('full scan'), kinds.count('temp b-tree'), kinds.count('non-covering index'))
+
+
+def _schema_clone(conn):
+    """Empty in-memory copy of the schema, for cheap what-if planning"""
+    clone = sqlite3.connect(':memory:')
+    for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL "
+        "AND name NOT LIKE 'sqlite_%' AND type IN ('table', 'index')"
+    ):
+        clone.execute(sql)
+    return clone
+
+
+def advise(conn, queries=None):
+    """
+    EXPLAIN every registered query (or `queries`: name -> (sql, params)),
+    flag plan issues and test each candidate index on a schema clone.
+    Returns one report dict per query.
+    """
+    queries = queries or {name: task_query(name)[1:] for name in TASK_QUERIES}
+    clone = _schema_clone(conn)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    reports = []
+
+    for name, (sql, params) in queries.items():
+        details = explain(conn, sql, params)
+        issues = plan_issues(details)
+        cost = plan_cost(issues)
+        suggestions = []
+        for index_name, create_sql in CANDIDATE_INDEXES.items():
+            if index_name in existing or not issues:
+                continue
+            # DDL is transactional in SQLite: create, plan, roll back
+            clone.execute("BEGIN")
+            try:
+                clone.execute(create_sql)
+                new_details = explain(clone, sql, params)
+            finally:
+                clone.execute("ROLLBACK")
+            new_cost = plan_cost(plan_issues(new_details))
+            if new_cost < cost:
+                suggestions.append({'index': index_name, 'sql': create_sql,
+                                    'cost': new_cost, 'plan': new_details})
+        suggestions.sort(key=lambda suggestion: suggestion['cost'])
+        reports.append({'name': name, 'plan': details, 'issues': issues,
+                        'cost': cost, 'suggestions': suggestions})
+
+    clone.close()
+    return reports
+
+
+def print_advice(reports):
+    """Print advise() results"""
+    for report in reports:
+        print(f"\n{report['name']}")
+        print("-" * 50)
+        for detail in report['plan']:
+            print(f"  {detail}")
+        if not report['issues']:
+            print("  ✓ No full scans or temp B-trees")
+            continue
+        for kind, detail in report['issues']:
+            print(f"  ⚠ {kind}: {detail}")
+        for suggestion in report['suggestions']:
+            print(f"  → Suggest: {suggestion['sql']}")
+        if not report['suggestions']:
+            print("  (no candidate index improves this plan)")
+
+
+def generate_dataset(db_path, students=100_000, grades_per_student=10, seed=42):
+    """Create a synthetic school database of the given size"""
+    rng = random.Random(seed)
+    subjects = ['Math', 'English', 'Science', 'History', 'Art',
+                'Physical Education', 'Biology', 'Chemistry', 'Physics', 'Music']
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    tables, indexes = schema_statements()
+    for sql in tables:
+        conn.execute(sql)
+    with conn:
+        conn.execute("INSERT INTO students (full_name, birth_year) VALUES ('Alice Johnson', 2005)")
+        conn.executemany(
+            "INSERT INTO students (full_name, birth_year) VALUES (?, ?)",
+            ((f"Student {i}", rng.randint(1998, 2008)) for i in range(students - 1)),
+        )
+        conn.executemany(
+            "INSERT INTO grades (student_id, subject, grade) VALUES (?, ?, ?)",
+            ((student_id, rng.choice(subjects), rng.randint(40, 100))
+             for student_id in range(1, students + 1)
+             for _ in range(grades_per_student)),
+        )
+        for create_sql in indexes.values():
+            conn.execute(create_sql)
+    ensure_summary_tables(conn)
+    conn.close()
+
+
+def time_query(conn, name, repeat=3):
+    """Best-of-N wall time of running a task query to completion, in ms"""
+    _, sql, params = task_query(name)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_advice(students=100_000, grades_per_student=10, repeat=3):
+    """
+    Generate a large dataset, time every task query, apply the suggested
+    indexes, and time them again
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        print(f"Generating {students} students x {grades_per_student} grades...")
+        generate_dataset(db_path, students, grades_per_student)
+        conn = sqlite3.connect(db_path)
+
+        before = {name: time_query(conn, name, repeat) for name in TASK_QUERIES}
+        reports = advise(conn)
+        applied = []
+        for report in reports:
+            if report['suggestions']:
+                best = report['suggestions'][0]
+                if best['index'] not in applied:
+                    conn.execute(best['sql'])
+                    applied.append(best['index'])
+        after = {name: time_query(conn, name, repeat) for name in TASK_QUERIES}
+        conn.close()
+
+    print(f"\nApplied indexes: {', '.join(applied) or 'none'}")
+    print(f"{'query':<22} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>8}")
+    print("-" * 58)
+    for name in TASK_QUERIES:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<22} {before[name]:>12.2f} {after[name]:>12.2f} {speedup:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plan diagnostics for the task queries")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Benchmark before/after the suggestions on generated data")
+    parser.add_argument('--students', type=int, default=100_000)
+    parser.add_argument('--grades-per-student', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_advice(args.students, args.grades_per_student)
+        return
+
+    conn = sqlite3.connect(args.db)
+    ensure_summary_tables(conn)
+    print_advice(advise(conn))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
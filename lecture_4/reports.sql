@@ -0,0 +1,78 @@
+-- ============================================
+-- SCHOOL DATABASE: REPORT QUERIES
+-- ============================================
+
+-- Read-only; never part of a build
+
+-- 1. REQUIRED QUERIES FROM THE TASK
+-- ============================================
+
+-- Query 1: All grades for a specific student (Alice Johnson)
+SELECT '1. All grades for Alice Johnson' as query_title;
+SELECT s.full_name, g.subject, g.grade
+FROM students s
+JOIN grades g ON s.id = g.student_id
+WHERE s.full_name = 'Alice Johnson';
+
+-- Query 2: Calculate the average grade per student
+SELECT '2. Average grade per student' as query_title;
+SELECT s.full_name, ROUND(AVG(g.grade), 2) as avg_grade
+FROM students s
+JOIN grades g ON s.id = g.student_id
+GROUP BY s.id, s.full_name
+ORDER BY avg_grade DESC;
+
+-- Query 3: List all students born after 2004
+SELECT '3. Students born after 2004' as query_title;
+SELECT full_name, birth_year
+FROM students
+WHERE birth_year > 2004
+ORDER BY birth_year;
+
+-- Query 4: List all subjects and their average grades
+SELECT '4. Subjects and their average grades' as query_title;
+SELECT subject, ROUND(AVG(grade), 2) as avg_grade
+FROM grades
+GROUP BY subject
+ORDER BY avg_grade DESC;
+
+-- Query 5: Find the top 3 students with the highest average grades
+SELECT '5. Top 3 students with highest average grades' as query_title;
+SELECT s.full_name, ROUND(AVG(g.grade), 2) as avg_grade
+FROM students s
+JOIN grades g ON s.id = g.student_id
+GROUP BY s.id, s.full_name
+ORDER BY avg_grade DESC
+LIMIT 3;
+
+-- Query 6: Show all students who have scored below 80 in any subject
+SELECT '6. Students who scored below 80 in any subject' as query_title;
+SELECT DISTINCT s.full_name, g.subject, g.grade
+FROM students s
+JOIN grades g ON s.id = g.student_id
+WHERE g.grade < 80
+ORDER BY s.full_name, g.grade;
+
+-- 2. ADDITIONAL VALIDATION QUERIES
+-- ============================================
+
+-- Show all students
+SELECT 'All students:' as query_title;
+SELECT * FROM students ORDER BY id;
+
+-- Show all grades with student names
+SELECT 'All grades with student names:' as query_title;
+SELECT g.id, s.full_name, g.subject, g.grade
+FROM grades g
+JOIN students s ON g.student_id = s.id
+ORDER BY s.full_name, g.subject;
+
+-- Database statistics
+SELECT 'Database statistics:' as query_title;
+SELECT 
+    (SELECT COUNT(*) FROM students) as total_students,
+    (SELECT COUNT(*) FROM grades) as total_grades,
+    (SELECT COUNT(DISTINCT subject) FROM grades) as total_subjects,
+    (SELECT MIN(grade) FROM grades) as min_grade,
+    (SELECT MAX(grade) FROM grades) as max_grade,
+    (SELECT ROUND(AVG(grade), 2) FROM grades) as avg_grade;
\ No newline at end of file
@@ -0,0 +1,32 @@
+-- ============================================
+-- SCHOOL DATABASE: SCHEMA
+-- ============================================
+
+-- Applied incrementally by schema_builder.py: unchanged statements are
+-- skipped, new ones are applied, changed indexes are recreated.
+
+-- 1. CREATE TABLES
+-- ============================================
+
+-- Students table
+CREATE TABLE students (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    full_name TEXT NOT NULL,
+    birth_year INTEGER  -- NULL when unknown
+);
+
+-- Grades table
+CREATE TABLE grades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    grade INTEGER NOT NULL CHECK (grade >= 1 AND grade <= 100),
+    FOREIGN KEY (student_id) REFERENCES students(id)
+);
+
+-- 2. CREATE INDEXES FOR OPTIMIZATION
+-- ============================================
+CREATE INDEX idx_student_id ON grades(student_id);
+CREATE INDEX idx_student_birth_year ON students(birth_year);
+CREATE INDEX idx_grade ON grades(grade);
+CREATE INDEX idx_subject ON grades(subject, grade);
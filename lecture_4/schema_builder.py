@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+
+from connection import get_connection, close_connection
+
+# Build inputs, applied in this order. reports.sql is deliberately not
+# here: running reports never changes what the database was built from.
+SECTIONS = [
+    ('schema', 'schema.sql'),
+    ('seed', 'seed.sql'),
+]
+
+META_SQL = """
+CREATE TABLE IF NOT EXISTS build_meta (
+    section TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    built_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS build_statements (
+    checksum TEXT PRIMARY KEY,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    sql TEXT NOT NULL
+);
+"""
+
+# Statements whose effect can be undone by name when they change
+_INDEX_RE = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)",
+                       re.IGNORECASE)
+
+# CREATE TABLE/INDEX not yet guarded by IF NOT EXISTS
+_CREATE_RE = re.compile(r"^(CREATE\s+(?:UNIQUE\s+)?(?:TABLE|INDEX))(?!\s+IF\s)\s+",
+                        re.IGNORECASE)
+
+
+def _checksum(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def split_statements(script):
+    """Split a SQL script into statements, dropping comment-only lines"""
+    statements = []
+    buffer = ""
+    for line in script.splitlines():
+        if not buffer and (not line.strip() or line.strip().startswith('--')):
+            continue
+        buffer += line + "\n"
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+def schema_statements(base_dir='.'):
+    """
+    The CREATE statements of schema.sql made idempotent (IF NOT EXISTS),
+    as ([table statements], {index name: statement}). For code that adds
+    to an existing database instead of building it.
+    """
+    with open(os.path.join(base_dir, dict(SECTIONS)['schema']), 'r', encoding='utf-8') as f:
+        statements = split_statements(f.read())
+    tables, indexes = [], {}
+    for sql in statements:
+        sql = _CREATE_RE.sub(r"\1 IF NOT EXISTS ", sql)
+        match = _INDEX_RE.match(sql)
+        if match:
+            indexes[match.group(1)] = sql
+        else:
+            tables.append(sql)
+    return tables, indexes
+
+
+def read_sections(base_dir='.'):
+    """
+    Return [(section, section checksum, [(statement checksum, sql), ...])].
+    Statement checksums ignore whitespace and count repeats, so two
+    identical INSERTs are two statements.
+    """
+    sections = []
+    for section, file_name in SECTIONS:
+        with open(os.path.join(base_dir, file_name), 'r', encoding='utf-8') as f:
+            script = f.read()
+        seen = {}
+        statements = []
+        for sql in split_statements(script):
+            normalized = " ".join(sql.split())
+            seen[normalized] = seen.get(normalized, 0) + 1
+            statements.append((_checksum(f"{section}:{seen[normalized]}:{normalized}"), sql))
+        section_checksum = _checksum("\n".join(checksum for checksum, _ in statements))
+        sections.append((section, section_checksum, statements))
+    return sections
+
+
+def _stored_checksums(conn):
+    has_meta = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'build_meta'"
+    ).fetchone()[0]
+    if not has_meta:
+        return None
+    return dict(conn.execute("SELECT section, checksum FROM build_meta"))
+
+
+def _record(conn, section, section_checksum, statements):
+    conn.execute(
+        "INSERT INTO build_meta (section, checksum) VALUES (?, ?) "
+        "ON CONFLICT(section) DO UPDATE SET checksum = excluded.checksum, "
+        "built_at = CURRENT_TIMESTAMP",
+        (section, section_checksum),
+    )
+    conn.execute("DELETE FROM build_statements WHERE section = ?", (section,))
+    conn.executemany(
+        "INSERT INTO build_statements (checksum, section, position, sql) VALUES (?, ?, ?, ?)",
+        [(checksum, section, position, sql)
+         for position, (checksum, sql) in enumerate(statements)],
+    )
+
+
+def _full_build(db_path, sections):
+    """Delete db_path and build it from scratch; only on request (force)"""
+    close_connection(db_path)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = get_connection(db_path)
+    with conn:
+        conn.executescript(META_SQL)
+    for section, section_checksum, statements in sections:
+        with conn:
+            for _, sql in statements:
+                conn.execute(sql)
+            _record(conn, section, section_checksum, statements)
+    return conn
+
+
+def _adopt(conn, sections):
+    """
+    Take over a database built without build_meta (older builds, the
+    sqlite3 CLI, bulk_load.py, lecture_3 --db): create only the missing
+    tables and indexes, seed only if the tables are still empty, and
+    record the checksums. Existing rows are never touched.
+    """
+    applied = 0
+    with conn:
+        conn.executescript(META_SQL)
+        populated = {
+            name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('students', 'grades')")
+            if conn.execute(f"SELECT 1 FROM {name} LIMIT 1").fetchone()
+        }
+        for section, section_checksum, statements in sections:
+            if section == 'schema':
+                objects = "SELECT COUNT(*) FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+                before = conn.execute(objects).fetchone()[0]
+                for _, sql in statements:
+                    conn.execute(_CREATE_RE.sub(r"\1 IF NOT EXISTS ", sql))
+                applied += conn.execute(objects).fetchone()[0] - before
+            elif not populated:
+                for _, sql in statements:
+                    conn.execute(sql)
+                applied += len(statements)
+            _record(conn, section, section_checksum, statements)
+    return applied
+
+
+def _plan_section(conn, section, statements):
+    """
+    Statements to apply and indexes to drop for one changed section, or
+    None if a change can't be applied without rebuilding
+    """
+    applied = dict(conn.execute(
+        "SELECT checksum, sql FROM build_statements WHERE section = ?", (section,)
+    ))
+    current = {checksum for checksum, _ in statements}
+    drops = []
+    for checksum, sql in applied.items():
+        if checksum in current:
+            continue
+        # A changed or removed index can be dropped; anything else
+        # (table definition, seed row) can't be undone in place
+        match = _INDEX_RE.match(sql)
+        if not match:
+            return None
+        drops.append(match.group(1))
+    pending = [sql for checksum, sql in statements if checksum not in applied]
+    return drops, pending
+
+
+def build_database(db_path='school.db', base_dir='.', force=False):
+    """
+    Bring db_path up to date with schema.sql and seed.sql.
+
+    Compares per-section checksums stored in build_meta; unchanged
+    sections cost one lookup. In a changed section only new statements
+    run (and changed indexes are recreated). A database without build
+    metadata is adopted as is (see _adopt). An existing database is
+    only deleted and rebuilt with force=True: a section whose table or
+    seed statements were edited or removed is left as it is and listed
+    in 'outdated'.
+    Returns {'action': 'unchanged' | 'incremental' | 'adopted' | 'rebuilt',
+    'applied': statements run, 'dropped': indexes dropped,
+    'outdated': sections that need force=True}.
+    """
+    sections = read_sections(base_dir)
+    total = sum(len(statements) for _, _, statements in sections)
+
+    if force or not os.path.exists(db_path):
+        _full_build(db_path, sections)
+        return {'action': 'rebuilt', 'applied': total, 'dropped': 0, 'outdated': []}
+
+    conn = get_connection(db_path)
+    stored = _stored_checksums(conn)
+    if stored is None:
+        applied = _adopt(conn, sections)
+        return {'action': 'adopted', 'applied': applied, 'dropped': 0, 'outdated': []}
+
+    changed = [(section, checksum, statements) for section, checksum, statements in sections
+               if stored.get(section) != checksum]
+    if not changed:
+        return {'action': 'unchanged', 'applied': 0, 'dropped': 0, 'outdated': []}
+
+    plans = []
+    outdated = []
+    for section, section_checksum, statements in changed:
+        plan = _plan_section(conn, section, statements)
+        if plan is None:
+            outdated.append(section)
+        else:
+            plans.append((section, section_checksum, statements, plan))
+
+    applied = dropped = 0
+    with conn:
+        for section, section_checksum, statements, (drops, pending) in plans:
+            for index_name in drops:
+                conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+            for sql in pending:
+                conn.execute(sql)
+            _record(conn, section, section_checksum, statements)
+            applied += len(pending)
+            dropped += len(drops)
+    return {'action': 'incremental', 'applied': applied, 'dropped': dropped,
+            'outdated': outdated}
+
+
+def is_up_to_date(db_path='school.db', base_dir='.'):
+    """True if db_path was built from the current schema.sql and seed.sql"""
+    if not os.path.exists(db_path):
+        return False
+    stored = _stored_checksums(get_connection(db_path))
+    return stored is not None and all(
+        stored.get(section) == checksum for section, checksum, _ in read_sections(base_dir)
+    )
+
+
+def record_build(db_path='school.db', base_dir='.'):
+    """Store checksums for a database built outside build_database (sqlite3 CLI)"""
+    conn = get_connection(db_path)
+    with conn:
+        conn.executescript(META_SQL)
+    for section, section_checksum, statements in read_sections(base_dir):
+        with conn:
+            _record(conn, section, section_checksum, statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally build school.db from schema.sql and seed.sql")
+    parser.add_argument('--db', default='school.db')
+    parser.add_argument('--force', action='store_true',
+                        help="Delete the database and rebuild it from scratch")
+    args = parser.parse_args()
+
+    result = build_database(args.db, force=args.force)
+    print(f"✓ {result['action']}: {result['applied']} statements applied, "
+          f"{result['dropped']} indexes dropped")
+    for section in result['outdated']:
+        print(f"• {section} changed in a way that can't be applied in place; "
+              f"existing data kept, rerun with --force to rebuild")
+
+
+if __name__ == "__main__":
+    main()
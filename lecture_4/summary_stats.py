@@ -0,0 +1,176 @@
+import sqlite3
+
+# Summary tables kept current by triggers on `grades`, so reports read
+# O(students) / O(subjects) rows instead of aggregating every grade.
+# avg_grade is stored (and indexed) so top-N queries are an index walk.
+SUMMARY_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS student_stats (
+    student_id INTEGER PRIMARY KEY,
+    grade_sum INTEGER NOT NULL,
+    grade_count INTEGER NOT NULL,
+    avg_grade REAL
+);
+CREATE INDEX IF NOT EXISTS idx_student_stats_avg ON student_stats(avg_grade DESC, student_id);
+
+CREATE TABLE IF NOT EXISTS subject_stats (
+    subject TEXT PRIMARY KEY,
+    grade_sum INTEGER NOT NULL,
+    grade_count INTEGER NOT NULL,
+    avg_grade REAL
+);
+
+CREATE TABLE IF NOT EXISTS grade_band_stats (
+    band TEXT PRIMARY KEY,
+    min_grade INTEGER NOT NULL,
+    grade_count INTEGER NOT NULL
+);
+"""
+
+# Letter-grade bands used by the distribution report: (label, lowest grade)
+GRADE_BANDS = [
+    ('A (90-100)', 90),
+    ('B (80-89)', 80),
+    ('C (70-79)', 70),
+    ('D (60-69)', 60),
+    ('F (below 60)', 1),
+]
+
+TRIGGER_NAMES = ('trg_grades_stats_insert', 'trg_grades_stats_delete', 'trg_grades_stats_update')
+
+
+def _band_case(row):
+    """SQL CASE mapping row.grade to its band label"""
+    whens = " ".join(
+        f"WHEN {row}.grade >= {low} THEN '{label}'" for label, low in GRADE_BANDS[:-1]
+    )
+    return f"CASE {whens} ELSE '{GRADE_BANDS[-1][0]}' END"
+
+
+def _add_grade_sql(row):
+    """Statements folding one grade row (NEW/OLD) into the summaries"""
+    return f"""
+    INSERT INTO student_stats (student_id, grade_sum, grade_count, avg_grade)
+    VALUES ({row}.student_id, {row}.grade, 1, {row}.grade)
+    ON CONFLICT(student_id) DO UPDATE SET
+        grade_sum = grade_sum + excluded.grade_sum,
+        grade_count = grade_count + 1,
+        avg_grade = (grade_sum + excluded.grade_sum) * 1.0 / (grade_count + 1);
+    INSERT INTO subject_stats (subject, grade_sum, grade_count, avg_grade)
+    VALUES ({row}.subject, {row}.grade, 1, {row}.grade)
+    ON CONFLICT(subject) DO UPDATE SET
+        grade_sum = grade_sum + excluded.grade_sum,
+        grade_count = grade_count + 1,
+        avg_grade = (grade_sum + excluded.grade_sum) * 1.0 / (grade_count + 1);
+    UPDATE grade_band_stats SET grade_count = grade_count + 1
+    WHERE band = {_band_case(row)};
+    """
+
+
+def _remove_grade_sql(row):
+    """Statements taking one grade row (NEW/OLD) out of the summaries"""
+    return f"""
+    UPDATE student_stats SET
+        grade_sum = grade_sum - {row}.grade,
+        grade_count = grade_count - 1,
+        avg_grade = CASE WHEN grade_count > 1
+                         THEN (grade_sum - {row}.grade) * 1.0 / (grade_count - 1) END
+    WHERE student_id = {row}.student_id;
+    DELETE FROM student_stats WHERE student_id = {row}.student_id AND grade_count <= 0;
+    UPDATE subject_stats SET
+        grade_sum = grade_sum - {row}.grade,
+        grade_count = grade_count - 1,
+        avg_grade = CASE WHEN grade_count > 1
+                         THEN (grade_sum - {row}.grade) * 1.0 / (grade_count - 1) END
+    WHERE subject = {row}.subject;
+    DELETE FROM subject_stats WHERE subject = {row}.subject AND grade_count <= 0;
+    UPDATE grade_band_stats SET grade_count = grade_count - 1
+    WHERE band = {_band_case(row)};
+    """
+
+
+TRIGGERS_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS trg_grades_stats_insert AFTER INSERT ON grades
+BEGIN
+{_add_grade_sql('NEW')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_grades_stats_delete AFTER DELETE ON grades
+BEGIN
+{_remove_grade_sql('OLD')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_grades_stats_update
+AFTER UPDATE OF student_id, subject, grade ON grades
+BEGIN
+{_remove_grade_sql('OLD')}
+{_add_grade_sql('NEW')}
+END;
+"""
+
+
+def rebuild_summary_tables(conn):
+    """Recompute all summaries from `grades` in one pass per table"""
+    with conn:
+        conn.execute("DELETE FROM student_stats")
+        conn.execute("""
+            INSERT INTO student_stats (student_id, grade_sum, grade_count, avg_grade)
+            SELECT student_id, SUM(grade), COUNT(*), AVG(grade)
+            FROM grades GROUP BY student_id
+        """)
+        conn.execute("DELETE FROM subject_stats")
+        conn.execute("""
+            INSERT INTO subject_stats (subject, grade_sum, grade_count, avg_grade)
+            SELECT subject, SUM(grade), COUNT(*), AVG(grade)
+            FROM grades GROUP BY subject
+        """)
+        conn.execute("DELETE FROM grade_band_stats")
+        conn.executemany(
+            "INSERT INTO grade_band_stats (band, min_grade, grade_count) VALUES (?, ?, 0)",
+            GRADE_BANDS,
+        )
+        conn.execute(f"""
+            UPDATE grade_band_stats SET grade_count = counts.n
+            FROM (
+                SELECT {_band_case('grades')} AS band, COUNT(*) AS n
+                FROM grades GROUP BY 1
+            ) AS counts
+            WHERE counts.band = grade_band_stats.band
+        """)
+
+
+def ensure_summary_tables(conn):
+    """
+    Create the summary tables and triggers if missing. The summaries are
+    rebuilt from the grades whenever a table or any trigger was missing,
+    since grades written without the triggers (e.g. an interrupted bulk
+    load) are not reflected in them.
+    """
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE (type = 'table' AND name = 'student_stats') "
+        f"OR (type = 'trigger' AND name IN ({', '.join('?' * len(TRIGGER_NAMES))}))",
+        TRIGGER_NAMES)}
+    conn.executescript(SUMMARY_TABLES_SQL)
+    if len(existing) < len(TRIGGER_NAMES) + 1:
+        rebuild_summary_tables(conn)
+    conn.executescript(TRIGGERS_SQL)
+
+
+def drop_summary_triggers(conn):
+    """Disable incremental maintenance, e.g. for a bulk load"""
+    for name in TRIGGER_NAMES:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def restore_summary_triggers(conn):
+    """Recompute summaries once and re-enable the triggers"""
+    conn.executescript(SUMMARY_TABLES_SQL)
+    rebuild_summary_tables(conn)
+    conn.executescript(TRIGGERS_SQL)
+
+
+if __name__ == "__main__":
+    connection = sqlite3.connect('school.db')
+    ensure_summary_tables(connection)
+    rebuild_summary_tables(connection)
+    connection.close()
+    print("✓ Summary tables rebuilt")
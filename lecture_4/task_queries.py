@@ -0,0 +1,69 @@
+# Queries from the task, by name: name -> (title, SQL, default parameters).
+# Values are bound, never formatted into the SQL, so each statement text is
+# constant and stays in the connection's statement cache between calls.
+# Queries 2, 4 and 5 read the trigger-maintained summary tables.
+TASK_QUERIES = {
+    'student_grades': (
+        "1. All grades for {0}",
+        """SELECT s.full_name, g.subject, g.grade
+           FROM students s
+           JOIN grades g ON s.id = g.student_id
+           WHERE s.full_name = ?""",
+        ('Alice Johnson',)),
+
+    'average_per_student': (
+        "2. Average grade per student",
+        """SELECT s.full_name, ROUND(st.avg_grade, 2) as avg_grade
+           FROM student_stats st
+           JOIN students s ON s.id = st.student_id
+           ORDER BY st.avg_grade DESC, st.student_id""",
+        ()),
+
+    'born_after': (
+        "3. Students born after {0}",
+        """SELECT full_name, birth_year
+           FROM students
+           WHERE birth_year > ?
+           ORDER BY birth_year""",
+        (2004,)),
+
+    'subject_averages': (
+        "4. Subjects and their average grades",
+        """SELECT subject, ROUND(avg_grade, 2) as avg_grade
+           FROM subject_stats
+           ORDER BY avg_grade DESC""",
+        ()),
+
+    'top_students': (
+        "5. Top {0} students with highest average grades",
+        """SELECT s.full_name, ROUND(st.avg_grade, 2) as avg_grade
+           FROM student_stats st
+           JOIN students s ON s.id = st.student_id
+           ORDER BY st.avg_grade DESC, st.student_id
+           LIMIT ?""",
+        (3,)),
+
+    'below_grade': (
+        "6. Students who scored below {0} in any subject",
+        """SELECT DISTINCT s.full_name, g.subject, g.grade
+           FROM students s
+           JOIN grades g ON s.id = g.student_id
+           WHERE g.grade < ?
+           ORDER BY s.full_name, g.grade""",
+        (80,)),
+}
+
+
+def task_query(name, params=None):
+    """Return (title, sql, params) for a registered query, defaults filled in"""
+    if name not in TASK_QUERIES:
+        raise KeyError(f"Unknown query '{name}'. Available: {', '.join(TASK_QUERIES)}")
+    title, sql, defaults = TASK_QUERIES[name]
+    params = tuple(params) if params is not None else defaults
+    return title.format(*params), sql, params
+
+
+def run_task_query(conn, name, params=None):
+    """Execute a registered query with bound parameters; returns the cursor"""
+    _, sql, params = task_query(name, params)
+    return conn.execute(sql, params)
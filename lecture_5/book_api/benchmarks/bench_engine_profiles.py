@@ -0,0 +1,103 @@
+"""
+Mixed read/write throughput of each SQLite engine profile under concurrency.
+
+Usage:
+    python benchmarks/bench_engine_profiles.py --threads 16 --seconds 10 --write-ratio 0.2
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from database import ENGINE_PROFILES, get_engine_profile, make_engine
+from models import Base, Book
+
+
+def seed(engine, rows, batch_size=50_000):
+    with engine.begin() as conn:
+        for start in range(0, rows, batch_size):
+            conn.execute(insert(Book), [
+                {"title": f"Seed {i}", "author": f"Author {i % 1000}", "year": 2000}
+                for i in range(start, min(start + batch_size, rows))
+            ])
+
+
+def run_profile(name, rows, threads, seconds, write_ratio):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", get_engine_profile(name))
+        Base.metadata.create_all(bind=engine)
+        seed(engine, rows)
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker(worker_id):
+            local = {"reads": 0, "writes": 0, "errors": 0}
+            sequence = 0
+            while time.perf_counter() < deadline:
+                try:
+                    if random.random() < write_ratio:
+                        sequence += 1
+                        with engine.begin() as conn:
+                            conn.execute(insert(Book).values(
+                                title=f"W{worker_id}-{sequence}", author="Writer", year=2024
+                            ))
+                        local["writes"] += 1
+                    else:
+                        with engine.connect() as conn:
+                            conn.execute(
+                                select(Book).where(Book.id == random.randint(1, rows))
+                            ).first()
+                        local["reads"] += 1
+                except OperationalError:
+                    # "database is locked" when a writer waits past busy_timeout
+                    local["errors"] += 1
+            with lock:
+                for key, value in local.items():
+                    counts[key] += value
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "threads": threads,
+        "write_ratio": write_ratio,
+        "reads_per_sec": round(counts["reads"] / elapsed, 1),
+        "writes_per_sec": round(counts["writes"] / elapsed, 1),
+        "errors": counts["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", nargs="+", default=sorted(ENGINE_PROFILES))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    for name in args.profiles:
+        result = run_profile(name, args.rows, args.threads, args.seconds, args.write_ratio)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare offset pagination with keyset (cursor) pagination on a large table.
+
+Usage:
+    python benchmarks/bench_pagination.py --rows 1000000 --page-size 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Book
+
+
+def seed(engine, rows, batch_size=50_000):
+    """Insert `rows` synthetic books in large executemany batches"""
+    with engine.begin() as conn:
+        for start in range(0, rows, batch_size):
+            stop = min(start + batch_size, rows)
+            conn.execute(
+                insert(Book),
+                [
+                    {"title": f"Title {i}", "author": f"Author {i % 5000}", "year": 1900 + i % 125}
+                    for i in range(start, stop)
+                ],
+            )
+
+
+def time_offset_page(session, skip, limit):
+    start = time.perf_counter()
+    session.query(Book).order_by(Book.id).offset(skip).limit(limit).all()
+    return time.perf_counter() - start
+
+
+def time_keyset_page(session, last_id, limit):
+    start = time.perf_counter()
+    session.query(Book).filter(Book.id > last_id).order_by(Book.id).limit(limit).all()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        print(f"Seeding {args.rows} books...")
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"  done in {time.perf_counter() - start:.1f}s\n")
+
+        session = sessionmaker(bind=engine)()
+        print(f"{'position':>10} | {'offset (ms)':>12} | {'keyset (ms)':>12}")
+        print("-" * 42)
+        for fraction in (0.0, 0.25, 0.5, 0.75, 0.99):
+            position = int(args.rows * fraction)
+            offset_ms = min(time_offset_page(session, position, args.page_size)
+                            for _ in range(args.repeat)) * 1000
+            # Book ids are 1-based and contiguous here, so id == position + 1
+            keyset_ms = min(time_keyset_page(session, position, args.page_size)
+                            for _ in range(args.repeat)) * 1000
+            print(f"{position:>10} | {offset_ms:>12.2f} | {keyset_ms:>12.2f}")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare two run_suite.py JSON reports scenario by scenario.
+
+Usage:
+    python benchmarks/compare.py baseline.json candidate.json --threshold 10
+"""
+import argparse
+import json
+
+METRICS = ["rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["size"], r["endpoint"], r["concurrency"]): r for r in report["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change flagged as a regression")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    regressions = 0
+    print(f"{'size':>8} {'endpoint':<12} {'conc':>4} "
+          + " ".join(f"{m:>16}" for m in METRICS) + f" {'errors':>10}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        cells = []
+        for metric in METRICS:
+            old, new = baseline[key][metric], candidate[key][metric]
+            change = (new - old) / old * 100 if old else 0.0
+            # Higher rps is better; higher latency is worse
+            worse = -change if metric == "rps" else change
+            flag = "!" if worse > args.threshold else " "
+            if flag == "!":
+                regressions += 1
+            cells.append(f"{new:>9.2f} {change:+5.1f}%{flag}")
+        # Failing requests are fast, so any new errors count as a regression
+        # even when the latency metrics improve
+        old_errors, new_errors = baseline[key].get("errors", 0), candidate[key].get("errors", 0)
+        flag = "!" if new_errors > old_errors else " "
+        if flag == "!":
+            regressions += 1
+        cells.append(f"{new_errors:>9d}{flag}")
+        size, endpoint, concurrency = key
+        print(f"{size:>8} {endpoint:<12} {concurrency:>4} " + " ".join(cells))
+    print(f"\n{regressions} metric(s) regressed: rps/latency by more than "
+          f"{args.threshold}%, or errors increased")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Concurrent load test comparing the sync and async database modes.
+
+Starts a uvicorn server per mode in a scratch directory, seeds it through
+POST /books/bulk and drives read endpoints at a fixed concurrency.
+
+Usage:
+    python benchmarks/load_test.py --modes sync async --concurrency 64 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, workdir, port):
+    env = dict(os.environ, BOOK_API_DB_MODE=mode, PYTHONPATH=APP_DIR)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server in {mode} mode did not start")
+
+
+def seed(base_url, books):
+    body = "\n".join(
+        json.dumps({"title": f"Book {i}", "author": f"Author {i % 500}", "year": 1950 + i % 70})
+        for i in range(books)
+    )
+    httpx.post(f"{base_url}/books/bulk?errors_only=true", content=body,
+               headers={"content-type": "application/x-ndjson"}, timeout=600)
+
+
+async def drive(base_url, books, concurrency, total):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker(client):
+        while not queue.empty():
+            queue.get_nowait()
+            if random.random() < 0.7:
+                url = f"/books/{random.randint(1, books)}"
+            else:
+                url = f"/books/search/?author=Author {random.randint(0, 499)}&limit=20"
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as workdir:
+            port = free_port()
+            server = start_server(mode, workdir, port)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                seed(base_url, args.books)
+                result = asyncio.run(drive(base_url, args.books, args.concurrency, args.requests))
+                print(json.dumps({"mode": mode, "concurrency": args.concurrency, **result}))
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Reproducible latency/throughput suite for the book_api endpoints.
+
+Every dataset size runs in a fresh subprocess against its own SQLite file;
+requests go through the in-process ASGI app (no network). Results are
+printed (or written with --output) as JSON sorted by size, endpoint and
+concurrency, so two runs can be compared with benchmarks/compare.py.
+
+Usage:
+    python benchmarks/run_suite.py --sizes 10000 100000 1000000 \
+        --concurrency 1 8 32 --requests 2000 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+ENDPOINTS = ["get_book", "list_offset", "list_cursor", "search", "create_book"]
+
+# Titles are "<word> <n>" so a one-word search matches size/len(WORDS) books
+WORDS = [f"word{i:03d}" for i in range(1000)]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def seed(db_path, size):
+    """Create the schema and load `size` books with one executemany"""
+    from database import make_engine, get_engine_profile
+    from models import Base
+
+    engine = make_engine(f"sqlite:///{db_path}", get_engine_profile())
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO books (title, author, year) VALUES (?, ?, ?)",
+            ((f"{WORDS[i % len(WORDS)]} {i}", f"Author {i % 5000}", 1900 + i % 125)
+             for i in range(size)),
+        )
+    conn.close()
+
+
+def make_request(endpoint, size, rng, counter, scenario=""):
+    """
+    Return (method, url, json_body) for one request of a scenario.
+    Created titles include `scenario` so runs sharing a database don't
+    collide on the (title, author) unique index.
+    """
+    from pagination import encode_cursor
+
+    if endpoint == "get_book":
+        return "GET", f"/books/{rng.randint(1, size)}", None
+    if endpoint == "list_offset":
+        return "GET", f"/books/?skip={rng.randint(0, max(0, size - 100))}&limit=100", None
+    if endpoint == "list_cursor":
+        after = encode_cursor(rng.randint(0, max(0, size - 100)))
+        return "GET", f"/books/?after={after}&limit=100", None
+    if endpoint == "search":
+        return "GET", f"/books/search/?title={rng.choice(WORDS)}&limit=50", None
+    if endpoint == "create_book":
+        counter[0] += 1
+        title = f"Bench {scenario} {counter[0]}"
+        return "POST", "/books/", {"title": title, "author": "Bench", "year": 2024}
+    raise ValueError(f"Unknown endpoint {endpoint!r}")
+
+
+async def drive(client, endpoint, size, concurrency, total, seed_value):
+    rng = random.Random(seed_value)
+    counter = [0]
+    scenario = f"{size}-c{concurrency}"
+    requests = [make_request(endpoint, size, rng, counter, scenario) for _ in range(total)]
+    latencies = []
+    errors = 0
+    position = 0
+
+    async def worker():
+        nonlocal position, errors
+        while position < len(requests):
+            method, url, body = requests[position]
+            position += 1
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run_size(size, endpoints, concurrency_levels, total, seed_value):
+    import httpx
+    import main
+
+    results = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in endpoints:
+            for concurrency in concurrency_levels:
+                result = await drive(client, endpoint, size, concurrency, total, seed_value)
+                results.append({"size": size, **result})
+    return results
+
+
+def worker_main(args):
+    """Child process: seed one dataset, run all scenarios, print JSON"""
+    seed_start = time.perf_counter()
+    seed(os.environ["BOOK_API_DB_PATH"], args.size)
+    seed_seconds = time.perf_counter() - seed_start
+    results = asyncio.run(
+        run_size(args.size, args.endpoints, args.concurrency, args.requests, args.seed)
+    )
+    print(json.dumps({"seed_seconds": round(seed_seconds, 2), "results": results}))
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(args)
+        return
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "db_mode": os.getenv("BOOK_API_DB_MODE", "sync"),
+            "db_profile": os.getenv("BOOK_API_DB_PROFILE", "default"),
+            "cache": args.cache,
+            "requests_per_scenario": args.requests,
+            "seed": args.seed,
+        },
+        "seed_seconds": {},
+        "results": [],
+    }
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, BOOK_API_DB_PATH=os.path.join(tmp, "bench.db"))
+            if not args.cache:
+                env["BOOK_API_CACHE_MAX_ENTRIES"] = "0"
+            command = [
+                sys.executable, os.path.abspath(__file__), "--worker",
+                "--size", str(size), "--requests", str(args.requests),
+                "--seed", str(args.seed), "--endpoints", *args.endpoints,
+                "--concurrency", *(str(level) for level in args.concurrency),
+            ]
+            print(f"Running size={size}...", file=sys.stderr)
+            output = subprocess.run(command, env=env, cwd=tmp, capture_output=True,
+                                    text=True, check=True).stdout
+            child = json.loads(output.strip().splitlines()[-1])
+            report["seed_seconds"][str(size)] = child["seed_seconds"]
+            report["results"].extend(child["results"])
+
+    report["results"].sort(key=lambda r: (r["size"], r["endpoint"], r["concurrency"]))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
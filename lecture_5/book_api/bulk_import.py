@@ -0,0 +1,148 @@
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models import Book
+from schemas import BookCreate, BulkImportItemResult
+from search_index import FTS_TABLE
+
+# SQLite caps bound parameters per statement, so DB dedupe lookups
+# are split into slices of this many titles
+DEDUPE_LOOKUP_SIZE = 900
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Yield (line_number, raw line) pairs from a streamed NDJSON body.
+    Lines are decoded per item, so bad UTF-8 only invalidates its own line.
+    """
+    buffer = b""
+    index = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield index, line
+                index += 1
+    if buffer.strip():
+        yield index, buffer.strip()
+
+
+class BulkImporter:
+    """
+    Validates, dedupes and inserts books in chunks, one transaction per chunk
+    """
+
+    def __init__(self, errors_only: bool = False):
+        self.errors_only = errors_only
+        self.pending: List[Tuple[int, BookCreate]] = []
+        self.seen = set()
+        self.results: List[BulkImportItemResult] = []
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    def _report(self, index: int, status: str, book_id: Optional[int] = None,
+                detail: Optional[str] = None):
+        if status == "created":
+            self.created += 1
+        elif status == "duplicate":
+            self.duplicates += 1
+        else:
+            self.invalid += 1
+        if status != "created" or not self.errors_only:
+            self.results.append(
+                BulkImportItemResult(index=index, status=status, id=book_id, detail=detail)
+            )
+
+    def add_raw(self, index: int, raw: bytes):
+        """Parse one UTF-8 JSON document and queue it"""
+        try:
+            self.add(index, json.loads(raw.decode("utf-8")))
+        except UnicodeDecodeError:
+            self._report(index, "invalid", detail="Invalid UTF-8")
+        except json.JSONDecodeError as e:
+            self._report(index, "invalid", detail=f"Invalid JSON: {e.msg}")
+
+    def add(self, index: int, data):
+        """Validate one decoded item and queue it, deduping within the request"""
+        try:
+            book = BookCreate.model_validate(data)
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            self._report(index, "invalid", detail=detail)
+            return
+
+        key = (book.title, book.author)
+        if key in self.seen:
+            self._report(index, "duplicate", detail="Duplicate within request")
+            return
+        self.seen.add(key)
+        self.pending.append((index, book))
+
+    def _lookup_ids(self, db: Session, keys):
+        """Map (title, author) pairs that already exist in the DB to their ids"""
+        found = {}
+        for start in range(0, len(keys), DEDUPE_LOOKUP_SIZE):
+            batch = set(keys[start:start + DEDUPE_LOOKUP_SIZE])
+            # SQLite won't seek an index for row-value IN lists, so probe by
+            # title (the index prefix) and match authors here
+            rows = db.execute(
+                select(Book.title, Book.author, Book.id)
+                .where(Book.title.in_({title for title, _ in batch}))
+            ).all()
+            found.update(
+                ((row[0], row[1]), row[2]) for row in rows if (row[0], row[1]) in batch
+            )
+        return found
+
+    def flush(self, db: Session):
+        """Insert all queued books in a single transaction"""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+
+        existing = self._lookup_ids(db, [(book.title, book.author) for _, book in pending])
+        to_insert = []
+        for index, book in pending:
+            if (book.title, book.author) in existing:
+                self._report(index, "duplicate", detail="Book with this title and author already exists")
+            else:
+                to_insert.append((index, book))
+
+        if to_insert:
+            # ON CONFLICT skips rows a concurrent writer added after the
+            # lookup above; RETURNING yields only the rows really inserted
+            inserted = {
+                (row.title, row.author): row.id
+                for row in db.execute(
+                    insert(Book.__table__)
+                    .on_conflict_do_nothing(index_elements=["title", "author"])
+                    .returning(Book.__table__.c.id, Book.__table__.c.title,
+                               Book.__table__.c.author),
+                    [book.model_dump() for _, book in to_insert],
+                )
+            }
+            if inserted:
+                db.execute(
+                    text(f"INSERT INTO {FTS_TABLE}(rowid, title, author) VALUES (:id, :title, :author)"),
+                    [{"id": book_id, "title": title, "author": author}
+                     for (title, author), book_id in inserted.items()],
+                )
+            for index, book in to_insert:
+                book_id = inserted.get((book.title, book.author))
+                if book_id is None:
+                    self._report(index, "duplicate", detail="Book with this title and author already exists")
+                else:
+                    self._report(index, "created", book_id=book_id)
+
+        db.commit()
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response
+
+from search_index import matches_search, normalize_terms
+
+# Cache limits, configurable through the environment
+CACHE_MAX_ENTRIES = int(os.getenv("BOOK_API_CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("BOOK_API_CACHE_TTL", "60"))
+CACHE_MAX_BYTES = int(os.getenv("BOOK_API_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Rough per-entry bookkeeping cost added to the body size
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class CacheEntry:
+    """
+    A serialized response plus what is needed to invalidate it
+    """
+    __slots__ = ("body", "etag", "expires_at", "book_ids", "criteria", "size")
+
+    def __init__(self, body: bytes, expires_at: float, book_ids=(), criteria=None):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.expires_at = expires_at
+        self.book_ids = frozenset(book_ids)
+        self.criteria = criteria
+        self.size = len(body) + ENTRY_OVERHEAD_BYTES + 8 * len(self.book_ids)
+
+
+class ResponseCache:
+    """
+    In-process LRU cache with TTL expiry and a memory bound.
+
+    Keys are ("book", id) or ("search", title, author, year, limit).
+    Writers bump `generation` on every invalidation; a reader only stores
+    its result if the generation is unchanged since it missed, so a slow
+    read can't re-insert data that a concurrent write just invalidated.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS,
+                 max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.size = 0
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body: bytes, generation: int, book_ids=(), criteria=None) -> CacheEntry:
+        entry = CacheEntry(body, time.monotonic() + self.ttl, book_ids, criteria)
+        with self._lock:
+            if generation != self.generation or entry.size > self.max_bytes:
+                return entry
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.size += entry.size
+            # Evict least recently used entries until both bounds hold
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def invalidate_book(self, book_id: int, new_values: Optional[dict] = None):
+        """
+        Drop the book's own entry and every search result it is in or,
+        given its new field values, would now appear in
+        """
+        with self._lock:
+            self.generation += 1
+            stale = [
+                key for key, entry in self._entries.items()
+                if key[0] == "search" and (
+                    book_id in entry.book_ids
+                    or (new_values is not None and matches_search(entry.criteria, new_values))
+                )
+            ]
+            stale.append(("book", book_id))
+            for key in stale:
+                if key in self._entries:
+                    self._remove(key)
+
+    def invalidate_searches(self):
+        """Drop all cached search results (e.g. after a bulk import)"""
+        with self._lock:
+            self.generation += 1
+            for key in [key for key in self._entries if key[0] == "search"]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.size = 0
+
+
+def book_key(book_id: int):
+    return ("book", book_id)
+
+
+def search_key(title: Optional[str], author: Optional[str], year: Optional[int], limit: int):
+    """
+    Normalize search parameters so equivalent queries share an entry.
+    A filter that was not given is None, unlike one without any words
+    (()), which matches nothing.
+    """
+    return ("search", normalize_terms(title) if title else None,
+            normalize_terms(author) if author else None, year or None, limit)
+
+
+def cached_response(request: Request, entry: CacheEntry) -> Response:
+    """
+    Build a JSON response from a cache entry, honouring If-None-Match
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if entry.etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": entry.etag})
+    return Response(content=entry.body, media_type="application/json",
+                    headers={"ETag": entry.etag})
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,173 @@
+from fastapi import HTTPException
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models import Book
+from schemas import BookCreate, BookUpdate, BookPage
+from pagination import encode_cursor
+from search_index import index_book, unindex_book, build_match_query, search_book_ids
+
+# Database operations behind the endpoints. They take a sync Session so the
+# same code runs in a threadpool (sync mode) or via AsyncSession.run_sync
+# (async mode), see database.run_db.
+
+
+def create_book(db: Session, book: BookCreate):
+    """
+    Insert a new book, rejecting duplicates by title and author
+    """
+    # Single INSERT ... ON CONFLICT DO NOTHING; the unique (title, author)
+    # index makes the duplicate check atomic and index-backed
+    db_book = db.scalars(
+        insert(Book)
+        .values(**book.model_dump())
+        .on_conflict_do_nothing(index_elements=["title", "author"])
+        .returning(Book)
+    ).first()
+
+    if db_book is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Book with this title and author already exists"
+        )
+
+    index_book(db, db_book)
+    db.commit()
+    return db_book
+
+
+def upsert_book(db: Session, book: BookCreate):
+    """
+    Create a book or update the year of the existing (title, author) book
+    """
+    db_book = db.scalars(
+        insert(Book)
+        .values(**book.model_dump())
+        .on_conflict_do_update(
+            index_elements=["title", "author"],
+            set_={"year": book.year},
+        )
+        .returning(Book),
+        execution_options={"populate_existing": True},
+    ).one()
+
+    index_book(db, db_book)
+    db.commit()
+    return db_book
+
+
+def list_books_offset(db: Session, skip: int, limit: int):
+    """
+    Page through books with OFFSET/LIMIT
+    """
+    return db.query(Book).order_by(Book.id).offset(skip).limit(limit).all()
+
+
+def list_books_after(db: Session, last_id: int, limit: int):
+    """
+    Page through books by seeking past the last seen id
+    """
+    # Fetch one extra row to know whether another page exists
+    books = (
+        db.query(Book)
+        .filter(Book.id > last_id)
+        .order_by(Book.id)
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(books) > limit:
+        books = books[:limit]
+        next_cursor = encode_cursor(books[-1].id)
+
+    return BookPage(items=books, next_cursor=next_cursor)
+
+
+def delete_book(db: Session, book_id: int):
+    """
+    Delete a book by its ID
+    """
+    book = db.query(Book).filter(Book.id == book_id).first()
+
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    unindex_book(db, book.id)
+    db.delete(book)
+    db.commit()
+
+
+def update_book(db: Session, book_id: int, book_update: BookUpdate):
+    """
+    Update the provided fields of a book
+    """
+    db_book = db.query(Book).filter(Book.id == book_id).first()
+
+    if not db_book:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    # Update only provided fields
+    update_data = book_update.model_dump(exclude_unset=True)
+
+    for field, value in update_data.items():
+        setattr(db_book, field, value)
+
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Book with this title and author already exists"
+        )
+    index_book(db, db_book)
+    db.commit()
+    return db_book
+
+
+def search_books(db: Session, title: Optional[str], author: Optional[str],
+                 year: Optional[int], limit: int):
+    """
+    Full-text search on title/author, OR'ed with an exact year match.
+    A title/author filter without any words matches no books.
+    """
+    match_query = build_match_query(title, author)
+
+    if not title and not author and not year:
+        return db.query(Book).order_by(Book.id).limit(limit).all()
+
+    # Relevance-ranked ids from the full-text index
+    ranked_ids = []
+    if match_query:
+        ranked_ids = [book_id for book_id, _ in search_book_ids(db, match_query, limit)]
+
+    # Year is OR'ed with the text filters, as before
+    if year and len(ranked_ids) < limit:
+        year_query = db.query(Book.id).filter(Book.year == year)
+        if ranked_ids:
+            year_query = year_query.filter(Book.id.notin_(ranked_ids))
+        year_ids = year_query.order_by(Book.id).limit(limit - len(ranked_ids)).all()
+        ranked_ids.extend(row[0] for row in year_ids)
+
+    if not ranked_ids:
+        return []
+
+    books_by_id = {
+        book.id: book for book in db.query(Book).filter(Book.id.in_(ranked_ids)).all()
+    }
+    return [books_by_id[book_id] for book_id in ranked_ids if book_id in books_by_id]
+
+
+def get_book(db: Session, book_id: int):
+    """
+    Get a specific book by its ID
+    """
+    book = db.query(Book).filter(Book.id == book_id).first()
+
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    return book
@@ -1,17 +1,150 @@
-from sqlalchemy import create_engine
+import os
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Database mode: "sync" (sync sessions on the threadpool) or
+# "async" (aiosqlite engine with AsyncSession)
+DATABASE_MODE = os.getenv("BOOK_API_DB_MODE", "sync")
+if DATABASE_MODE not in ("sync", "async"):
+    raise ValueError(f"BOOK_API_DB_MODE must be 'sync' or 'async', got {DATABASE_MODE!r}")
+
+# SQLite database file and URLs
+DATABASE_PATH = os.getenv("BOOK_API_DB_PATH", "./books.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+
+# Engine profiles: SQLite pragmas applied to every new connection plus pool
+# sizing. "default" keeps SQLite's stock settings (rollback journal, full
+# fsync per commit). "wal" lets readers run alongside a writer and only
+# fsyncs at checkpoints. "durable" is WAL with a full fsync per commit.
+ENGINE_PROFILES = {
+    "default": {
+        "pragmas": {},
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "wal": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,        # negative = KiB, so 64 MB
+            "mmap_size": 268435456,      # 256 MB
+            "busy_timeout": 5000,        # ms to wait on a locked database
+            "temp_store": "MEMORY",
+        },
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+    "durable": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "cache_size": -64000,
+            "busy_timeout": 5000,
+        },
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+}
+
+# Pragmas that can be overridden one by one, e.g. BOOK_API_SQLITE_SYNCHRONOUS=OFF
+TUNABLE_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout")
+
+
+def get_engine_profile(name=None):
+    """
+    Resolve an engine profile by name (BOOK_API_DB_PROFILE by default),
+    applying per-setting environment overrides
+    """
+    name = name or os.getenv("BOOK_API_DB_PROFILE", "default")
+    if name not in ENGINE_PROFILES:
+        raise ValueError(
+            f"BOOK_API_DB_PROFILE must be one of {sorted(ENGINE_PROFILES)}, got {name!r}"
+        )
+    profile = ENGINE_PROFILES[name]
+    pragmas = dict(profile["pragmas"])
+    for pragma in TUNABLE_PRAGMAS:
+        value = os.getenv(f"BOOK_API_SQLITE_{pragma.upper()}")
+        if value is not None:
+            pragmas[pragma] = value
+    return {
+        "name": name,
+        "pragmas": pragmas,
+        "pool_size": int(os.getenv("BOOK_API_DB_POOL_SIZE", profile["pool_size"])),
+        "max_overflow": int(os.getenv("BOOK_API_DB_MAX_OVERFLOW", profile["max_overflow"])),
+    }
+
+
+def _apply_pragmas(sync_engine, pragmas):
+    """Run the profile's PRAGMAs on every new DBAPI connection"""
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./books.db"
 
-# Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+def make_engine(url=SQLALCHEMY_DATABASE_URL, profile=None):
+    """
+    Create a sync engine configured by an engine profile
+    """
+    profile = profile or get_engine_profile()
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+    )
+    _apply_pragmas(sync_engine, profile["pragmas"])
+    return sync_engine
+
+
+def make_async_engine(url=ASYNC_SQLALCHEMY_DATABASE_URL, profile=None):
+    """
+    Create an aiosqlite engine configured by an engine profile
+    """
+    profile = profile or get_engine_profile()
+    new_engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+    )
+    _apply_pragmas(new_engine.sync_engine, profile["pragmas"])
+    return new_engine
+
+
+# Active engine profile, picked by BOOK_API_DB_PROFILE
+ENGINE_PROFILE = get_engine_profile()
+
+# Create engine (also used for schema setup in async mode)
+engine = make_engine(SQLALCHEMY_DATABASE_URL, ENGINE_PROFILE)
+
+# Create session factory; objects stay loaded after commit so endpoints
+# can serialize them without another round trip
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async engine and session factory, only built in async mode
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_MODE == "async":
+    async_engine = make_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, ENGINE_PROFILE)
+    # Objects must stay readable after commit without lazy-loading IO
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
 # Base class for models
 Base = declarative_base()
@@ -22,4 +155,18 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependency used by the endpoints, picked by BOOK_API_DB_MODE
+get_session = get_async_db if DATABASE_MODE == "async" else get_db
+
+# Run a function taking a sync Session without blocking the event loop
+async def run_db(db, fn, *args):
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
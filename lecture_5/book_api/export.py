@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, List, Sequence
+
+from sqlalchemy import select
+
+from database import engine, async_engine
+from models import Book
+
+# Columns written by the export, in output order
+EXPORT_COLUMNS = ["id", "title", "author", "year"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_query():
+    table = Book.__table__
+    return select(*(table.c[name] for name in EXPORT_COLUMNS)).order_by(table.c.id)
+
+
+def format_rows(rows: Sequence[Sequence], fmt: str) -> bytes:
+    """
+    Encode one chunk of rows as NDJSON lines or CSV records
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def _header(fmt: str) -> List[bytes]:
+    return [format_rows([EXPORT_COLUMNS], "csv")] if fmt == "csv" else []
+
+
+def iter_export(fmt: str, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yield the whole books table chunk by chunk from one server-side cursor.
+    Owns its connection so it outlives the request's session.
+    """
+    yield from _header(fmt)
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(_export_query())
+        for rows in result.partitions():
+            yield format_rows(rows, fmt)
+
+
+async def aiter_export(fmt: str, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Async variant of iter_export streaming through the aiosqlite engine
+    """
+    for header in _header(fmt):
+        yield header
+    async with async_engine.connect() as conn:
+        result = await conn.stream(_export_query(), execution_options={"yield_per": chunk_size})
+        async for rows in result.partitions():
+            yield format_rows(rows, fmt)
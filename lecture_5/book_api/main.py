@@ -1,15 +1,31 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+import json
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter
+from typing import List, Literal, Optional, Union
 
 # Import from local modules
-from database import engine, get_db
-from models import Book, Base
-from schemas import BookCreate, BookResponse, BookUpdate, BookSearch
+import crud
+from database import DATABASE_MODE, engine, async_engine, get_session, run_db
+from models import Base, upgrade_title_author_index
+from schemas import (
+    BookCreate, BookResponse, BookUpdate, BookSearch, BookPage, BulkImportResponse
+)
+from pagination import decode_cursor
+from bulk_import import BulkImporter, iter_ndjson
+from search_index import create_search_index
+from export import MEDIA_TYPES, iter_export, aiter_export
+from cache import response_cache, book_key, search_key, cached_response
+from metrics import instrument_engine, metrics_middleware, metrics_registry
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_title_author_index(engine)
+create_search_index(engine)
+
+# Serializers for cached responses
+book_list_adapter = TypeAdapter(List[BookResponse])
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -18,126 +34,201 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Request and SQL instrumentation
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+app.middleware("http")(metrics_middleware)
+
 # Home endpoint
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Book Collection API"}
 
+# GET /metrics - Prometheus metrics
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
 # 1. POST /books/ - Add a new book
 @app.post("/books/", response_model=BookResponse, status_code=201)
-def create_book(book: BookCreate, db: Session = Depends(get_db)):
+async def create_book(book: BookCreate, db=Depends(get_session)):
     """
     Add a new book to the collection
     """
-    # Check if book already exists
-    existing_book = db.query(Book).filter(
-        Book.title == book.title,
-        Book.author == book.author
-    ).first()
-    
-    if existing_book:
-        raise HTTPException(
-            status_code=400,
-            detail="Book with this title and author already exists"
-        )
-    
-    # Create new book instance
-    db_book = Book(**book.model_dump())
-    db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
+    db_book = await run_db(db, crud.create_book, book)
+    response_cache.invalidate_book(db_book.id, book.model_dump())
     return db_book
 
-# 2. GET /books/ - Get all books (with optional pagination)
-@app.get("/books/", response_model=List[BookResponse])
-def get_all_books(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+# 1b. POST /books/bulk - Import many books at once
+@app.post("/books/bulk", response_model=BulkImportResponse)
+async def bulk_import_books(
+    request: Request,
+    chunk_size: int = Query(5000, ge=1, le=50000, description="Books inserted per transaction"),
+    errors_only: bool = Query(False, description="Only report duplicate and invalid items"),
+    db=Depends(get_session)
+):
+    """
+    Import books from a JSON array or a streamed NDJSON body
+    (Content-Type: application/x-ndjson). Items are validated and deduped
+    in memory and against the database, then inserted in batches.
+    """
+    importer = BulkImporter(errors_only=errors_only)
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        # Parse the body as it arrives, flushing full chunks off the event loop
+        async for index, line in iter_ndjson(request.stream()):
+            importer.add_raw(index, line)
+            if len(importer.pending) >= chunk_size:
+                await run_db(db, importer.flush)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        for index, item in enumerate(items):
+            importer.add(index, item)
+            if len(importer.pending) >= chunk_size:
+                await run_db(db, importer.flush)
+
+    await run_db(db, importer.flush)
+    if importer.created:
+        response_cache.invalidate_searches()
+
+    return BulkImportResponse(
+        created=importer.created,
+        duplicates=importer.duplicates,
+        invalid=importer.invalid,
+        results=sorted(importer.results, key=lambda result: result.index),
+    )
+
+# 2. GET /books/ - Get all books (offset or keyset/cursor pagination)
+@app.get("/books/", response_model=Union[BookPage, List[BookResponse]])
+async def get_all_books(
+    skip: int = Query(0, ge=0, description="Number of records to skip (offset mode)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    paginate: Literal["offset", "cursor"] = Query("offset", description="Pagination mode"),
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db=Depends(get_session)
+):
+    """
+    Get all books from the collection with pagination.
+
+    Offset mode returns a plain list. Cursor mode (selected by
+    paginate=cursor or by passing `after`) seeks on the primary key, so
+    every page costs the same, and returns items plus next_cursor.
+    """
+    if paginate == "offset" and after is None:
+        return await run_db(db, crud.list_books_offset, skip, limit)
+
+    last_id = decode_cursor(after or "")
+    if last_id is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return await run_db(db, crud.list_books_after, last_id, limit)
+
+# 2b. GET /books/export - Stream the whole collection
+@app.get("/books/export")
+def export_books(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    chunk_size: int = Query(1000, ge=1, le=50000, description="Rows fetched per cursor round trip"),
 ):
     """
-    Get all books from the collection with pagination
+    Stream every book as NDJSON or CSV. Rows come from a server-side
+    cursor in chunks, so memory use doesn't grow with the table.
     """
-    books = db.query(Book).offset(skip).limit(limit).all()
-    return books
+    if DATABASE_MODE == "async":
+        body = aiter_export(format, chunk_size)
+    else:
+        body = iter_export(format, chunk_size)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+    )
 
 # 3. DELETE /books/{book_id} - Delete a book by ID
 @app.delete("/books/{book_id}", status_code=204)
-def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, db=Depends(get_session)):
     """
     Delete a book by its ID
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    
-    db.delete(book)
-    db.commit()
+    await run_db(db, crud.delete_book, book_id)
+    response_cache.invalidate_book(book_id)
     return None
 
+# 4a. PUT /books/upsert - Create or update a book in one statement
+@app.put("/books/upsert", response_model=BookResponse)
+async def upsert_book(book: BookCreate, db=Depends(get_session)):
+    """
+    Create the book, or update the year of the existing book with the
+    same title and author, atomically
+    """
+    db_book = await run_db(db, crud.upsert_book, book)
+    response_cache.invalidate_book(db_book.id, book.model_dump())
+    return db_book
+
 # 4. PUT /books/{book_id} - Update book details
 @app.put("/books/{book_id}", response_model=BookResponse)
-def update_book(book_id: int, book_update: BookUpdate, db: Session = Depends(get_db)):
+async def update_book(book_id: int, book_update: BookUpdate, db=Depends(get_session)):
     """
     Update book details by ID
     """
-    db_book = db.query(Book).filter(Book.id == book_id).first()
-    
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    
-    # Update only provided fields
-    update_data = book_update.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(db_book, field, value)
-    
-    db.commit()
-    db.refresh(db_book)
+    db_book = await run_db(db, crud.update_book, book_id, book_update)
+    response_cache.invalidate_book(
+        book_id, {"title": db_book.title, "author": db_book.author, "year": db_book.year}
+    )
     return db_book
 
 # 5. GET /books/search/ - Search books by title, author, or year
 @app.get("/books/search/", response_model=List[BookResponse])
-def search_books(
+async def search_books(
+    request: Request,
     title: Optional[str] = None,
     author: Optional[str] = None,
     year: Optional[int] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of results"),
+    db=Depends(get_session)
 ):
     """
-    Search books by title, author, or year
-    """
-    query = db.query(Book)
-    
-    # Build search conditions
-    conditions = []
-    if title:
-        conditions.append(Book.title.ilike(f"%{title}%"))
-    if author:
-        conditions.append(Book.author.ilike(f"%{author}%"))
-    if year:
-        conditions.append(Book.year == year)
-    
-    # Apply conditions if any
-    if conditions:
-        query = query.filter(or_(*conditions))
-    
-    books = query.all()
-    return books
+    Search books by title, author, or year.
+
+    Title and author words are prefix-matched through the FTS5 index and
+    ranked by relevance; year matches are appended after the text hits.
+    Results are cached and carry an ETag.
+    """
+    key = search_key(title, author, year, limit)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        books = await run_db(db, crud.search_books, title, author, year, limit)
+        body = book_list_adapter.dump_json(
+            book_list_adapter.validate_python(books, from_attributes=True)
+        )
+        entry = response_cache.put(
+            key, body, generation, book_ids=[book.id for book in books], criteria=key[1:4]
+        )
+    return cached_response(request, entry)
 
 # 6. GET /books/{book_id} - Get a specific book by ID
 @app.get("/books/{book_id}", response_model=BookResponse)
-def get_book_by_id(book_id: int, db: Session = Depends(get_db)):
+async def get_book_by_id(book_id: int, request: Request, db=Depends(get_session)):
     """
-    Get a specific book by its ID
+    Get a specific book by its ID (cached, with ETag support)
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    
-    return book
+    key = book_key(book_id)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        book = await run_db(db, crud.get_book, book_id)
+        body = BookResponse.model_validate(book).model_dump_json().encode()
+        entry = response_cache.put(key, body, generation)
+    return cached_response(request, entry)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,216 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+
+# Slow query log threshold in milliseconds; unset or 0 disables it
+SLOW_QUERY_MS = float(os.getenv("BOOK_API_SLOW_QUERY_MS", "0"))
+
+slow_query_logger = logging.getLogger("book_api.slow_query")
+
+# Histogram bucket upper bounds, in seconds / number of queries
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style
+    """
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class RequestStats:
+    """
+    SQL activity of the request currently being handled
+    """
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set per request by the middleware. Threadpool calls and run_sync greenlets
+# inherit the context, so the SQL hooks update the right request's stats.
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class MetricsRegistry:
+    """
+    Per-route request latency, per-request query counts/time and SQL timings
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.request_queries: Dict[Tuple[str, str], Histogram] = {}
+        self.request_db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_latency = Histogram(LATENCY_BUCKETS)
+        self.slow_queries = 0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float,
+                        stats: RequestStats):
+        with self._lock:
+            key = (method, route, str(status))
+            self.request_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            route_key = (method, route)
+            self.request_queries.setdefault(
+                route_key, Histogram(QUERY_COUNT_BUCKETS)
+            ).observe(stats.queries)
+            self.request_db_time.setdefault(
+                route_key, Histogram(LATENCY_BUCKETS)
+            ).observe(stats.db_seconds)
+
+    def observe_query(self, seconds: float, slow: bool):
+        with self._lock:
+            self.sql_latency.observe(seconds)
+            if slow:
+                self.slow_queries += 1
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            _render_family(
+                lines, "book_api_request_duration_seconds",
+                "HTTP request latency by route", ("method", "route", "status"),
+                self.request_latency,
+            )
+            _render_family(
+                lines, "book_api_request_db_queries",
+                "SQL statements executed per request", ("method", "route"),
+                self.request_queries,
+            )
+            _render_family(
+                lines, "book_api_request_db_seconds",
+                "Time spent in SQL per request", ("method", "route"),
+                self.request_db_time,
+            )
+            _render_family(
+                lines, "book_api_sql_query_duration_seconds",
+                "Latency of individual SQL statements", (), {(): self.sql_latency},
+            )
+            lines.append("# HELP book_api_slow_queries_total SQL statements over the slow query threshold")
+            lines.append("# TYPE book_api_slow_queries_total counter")
+            lines.append(f"book_api_slow_queries_total {self.slow_queries}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_family(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            bucket_labels = _format_labels(label_names, labels, 'le="%s"' % bound)
+            lines.append(f"{name}_bucket{bucket_labels} {count}")
+        inf_labels = _format_labels(label_names, labels, 'le="+Inf"')
+        lines.append(f"{name}_bucket{inf_labels} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(label_names, labels)} {histogram.total}")
+        lines.append(f"{name}_count{_format_labels(label_names, labels)} {histogram.count}")
+
+
+metrics_registry = MetricsRegistry()
+
+
+def instrument_engine(sync_engine):
+    """
+    Time every SQL statement on this engine and attribute it to the request
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        slow = SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS
+        if slow:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms, executemany=%s): %s", elapsed * 1000, executemany,
+                " ".join(statement.split()),
+            )
+        metrics_registry.observe_query(elapsed, slow)
+
+
+async def _observe_when_sent(body_iterator, observe):
+    """Pass the body through, calling observe() once it is fully sent"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        observe()
+
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    Record latency and SQL activity for each request, grouped by route
+    template, and expose them in a Server-Timing header.
+
+    Metrics are recorded when the body has been sent, so streamed
+    responses (e.g. /books/export) include the queries and time spent
+    producing the body. Server-Timing has to go out with the headers, so
+    for streamed responses it only covers the time to the first byte.
+    """
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+
+    def observe():
+        metrics_registry.observe_request(
+            request.method, route_path, response.status_code,
+            time.perf_counter() - start, stats
+        )
+
+    response.body_iterator = _observe_when_sent(response.body_iterator, observe)
+    response.headers["Server-Timing"] = (
+        f"db;dur={stats.db_seconds * 1000:.2f};desc=\"{stats.queries} queries\", "
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+    return response
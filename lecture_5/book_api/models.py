@@ -1,10 +1,77 @@
-from sqlalchemy import Column, Integer, String
+import logging
+import os
+
+from sqlalchemy import Column, Index, Integer, String, text
 from database import Base
 
+logger = logging.getLogger("book_api.models")
+
+# Older databases may hold duplicate (title, author) rows, which block the
+# unique index. With BOOK_API_DEDUPE_BOOKS=1 the upgrade keeps the lowest
+# id of each pair and deletes the rest; otherwise startup stops and lists them.
+DEDUPE_BOOKS = os.getenv("BOOK_API_DEDUPE_BOOKS", "") == "1"
+
+# Duplicate pairs named in the startup error
+DUPLICATES_SHOWN = 5
+
 class Book(Base):
     __tablename__ = "books"
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     author = Column(String, nullable=False)
-    year = Column(Integer, nullable=True)
\ No newline at end of file
+    year = Column(Integer, nullable=True)
+
+    # A book is identified by its title and author; the unique index backs
+    # the ON CONFLICT inserts and the duplicate lookups
+    __table_args__ = (Index("ix_books_title_author", "title", "author", unique=True),)
+
+
+def upgrade_title_author_index(engine, dedupe=None):
+    """
+    Make the (title, author) index unique on databases created before it was.
+    Duplicate rows are removed (lowest id kept, each deletion logged) when
+    `dedupe` is set (default: BOOK_API_DEDUPE_BOOKS); otherwise a
+    RuntimeError names them.
+    """
+    dedupe = DEDUPE_BOOKS if dedupe is None else dedupe
+    with engine.begin() as conn:
+        indexes = conn.execute(text("PRAGMA index_list('books')")).all()
+        # PRAGMA index_list rows: (seq, name, unique, origin, partial)
+        if any(row[1] == "ix_books_title_author" and row[2] for row in indexes):
+            return
+
+        duplicates = conn.execute(text(
+            "SELECT title, author, COUNT(*) FROM books "
+            "GROUP BY title, author HAVING COUNT(*) > 1"
+        )).all()
+        if duplicates and not dedupe:
+            shown = "; ".join(
+                f"{title!r} by {author!r} ({count} rows)"
+                for title, author, count in duplicates[:DUPLICATES_SHOWN]
+            )
+            raise RuntimeError(
+                f"Can't add the unique (title, author) index: {len(duplicates)} "
+                f"title/author pairs occur more than once ({shown}). Remove or "
+                "rename the duplicate books, or start once with "
+                "BOOK_API_DEDUPE_BOOKS=1 to keep the lowest id of each pair "
+                "and delete the others."
+            )
+        if duplicates:
+            extra = conn.execute(text(
+                "SELECT id, title, author FROM books AS b WHERE id > "
+                "(SELECT MIN(id) FROM books WHERE title = b.title AND author = b.author)"
+            )).all()
+            for book_id, title, author in extra:
+                logger.warning("Deleting duplicate book %d (%r by %r)", book_id, title, author)
+            conn.execute(text(
+                "DELETE FROM books WHERE id IN (SELECT id FROM books AS b WHERE id > "
+                "(SELECT MIN(id) FROM books WHERE title = b.title AND author = b.author))"
+            ))
+            # The search index no longer matches the row count and is
+            # rebuilt by create_search_index
+
+        conn.execute(text("DROP INDEX IF EXISTS ix_books_title_author"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX ix_books_title_author ON books (title, author)"
+        ))
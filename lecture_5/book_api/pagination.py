@@ -0,0 +1,36 @@
+import base64
+import json
+from typing import Optional
+
+
+# Cursor tokens are opaque to clients: base64url-encoded JSON holding the
+# last seen Book.id. Clients must pass them back unchanged as `after`.
+
+# Largest id SQLite can store (signed 64-bit INTEGER)
+MAX_CURSOR_ID = 2**63 - 1
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Build an opaque cursor token pointing after the given book id
+    """
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Optional[int]:
+    """
+    Decode a cursor token back to a book id, None if the token is invalid
+    """
+    if not token:
+        return 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    # bool is an int subclass, but {"id": true} is not a valid cursor
+    if (not isinstance(last_id, int) or isinstance(last_id, bool)
+            or not 0 <= last_id <= MAX_CURSOR_ID):
+        return None
+    return last_id
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 
 # Base schema for Book
 class BookBase(BaseModel):
@@ -24,6 +24,25 @@ class BookResponse(BookBase):
     class Config:
         from_attributes = True  # Updated from orm_mode
 
+# Schema for a keyset-paginated page of books
+class BookPage(BaseModel):
+    items: List[BookResponse]
+    next_cursor: Optional[str] = None
+
+# Schema for the outcome of one item in a bulk import
+class BulkImportItemResult(BaseModel):
+    index: int
+    status: Literal["created", "duplicate", "invalid"]
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+# Schema for a bulk import summary
+class BulkImportResponse(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[BulkImportItemResult]
+
 # Schema for search parameters
 class BookSearch(BaseModel):
     title: Optional[str] = None
@@ -0,0 +1,130 @@
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# FTS5 virtual table mirroring books.title / books.author.
+# The FTS rowid is the Book.id, so hits map straight back to books.
+FTS_TABLE = "books_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(engine):
+    """
+    Create the FTS5 index if missing and backfill it from existing books
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(title, author, tokenize='unicode61 remove_diacritics 2')"
+        ))
+        indexed = conn.execute(text(f"SELECT COUNT(*) FROM {FTS_TABLE}")).scalar()
+        total = conn.execute(text("SELECT COUNT(*) FROM books")).scalar()
+        if indexed != total:
+            rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn):
+    """
+    Repopulate the FTS5 index from the books table
+    """
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    conn.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, author) SELECT id, title, author FROM books"
+    ))
+
+
+def index_book(db: Session, book):
+    """
+    Add or replace a book in the search index (call before commit)
+    """
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": book.id})
+    db.execute(
+        text(f"INSERT INTO {FTS_TABLE}(rowid, title, author) VALUES (:id, :title, :author)"),
+        {"id": book.id, "title": book.title, "author": book.author},
+    )
+
+
+def unindex_book(db: Session, book_id: int):
+    """
+    Remove a book from the search index (call before commit)
+    """
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": book_id})
+
+
+def _column_query(column: str, value: str) -> Optional[str]:
+    """Turn free text into an FTS5 prefix query restricted to one column"""
+    tokens = _TOKEN_RE.findall(value)
+    if not tokens:
+        return None
+    # Quote every token so user input can never inject FTS5 syntax
+    terms = " ".join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+    return f"{column} : ({terms})"
+
+
+def build_match_query(title: Optional[str] = None, author: Optional[str] = None) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression OR'ing the title and author filters
+    """
+    parts = []
+    if title:
+        parts.append(_column_query("title", title))
+    if author:
+        parts.append(_column_query("author", author))
+    parts = [part for part in parts if part]
+    if not parts:
+        return None
+    return " OR ".join(f"({part})" for part in parts)
+
+
+def search_book_ids(db: Session, match_query: str, limit: int) -> List[Tuple[int, float]]:
+    """
+    Return (book_id, rank) pairs best-first; lower (bm25) rank is more relevant
+    """
+    rows = db.execute(
+        text(
+            f"SELECT rowid, rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH :query ORDER BY rank LIMIT :limit"
+        ),
+        {"query": match_query, "limit": limit},
+    ).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+def normalize_terms(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Split text into casefolded, accent-free tokens the way unicode61 does
+    """
+    if not value:
+        return ()
+    stripped = "".join(
+        char for char in unicodedata.normalize("NFKD", value)
+        if not unicodedata.combining(char)
+    )
+    return tuple(token.casefold() for token in _TOKEN_RE.findall(stripped))
+
+
+def _column_matches(terms: Tuple[str, ...], text_value: str) -> bool:
+    if not terms:
+        return False
+    tokens = normalize_terms(text_value)
+    return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+
+def matches_search(criteria, book: dict) -> bool:
+    """
+    Python mirror of search_books: would `book` satisfy this search?
+    `criteria` is (title_terms, author_terms, year) as built by search_key.
+    """
+    title_terms, author_terms, year = criteria
+    if title_terms is None and author_terms is None and not year:
+        # Unfiltered listing: any change can affect it
+        return True
+    return (
+        _column_matches(title_terms, book.get("title") or "")
+        or _column_matches(author_terms, book.get("author") or "")
+        or (bool(year) and book.get("year") == year)
+    )